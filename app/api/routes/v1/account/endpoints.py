@@ -32,7 +32,6 @@ async def create_account(
         account_service: AccountService = Depends(get_account_service)
 ) -> AccountResponse:
     """Create a new account."""
-    print("Received request data:", request.model_dump())  # Debugging step
     account = await account_service.create_account(**request.model_dump())
     return new_account_response(account)
 
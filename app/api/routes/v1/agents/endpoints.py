@@ -1,12 +1,15 @@
 # app/api/routes/v1/agent/endpoints.py
-from typing import Dict, Optional
-from fastapi import Depends, HTTPException, Path, Body
-from fastapi.responses import JSONResponse
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+import orjson
+from fastapi import Depends, HTTPException, Path, Body, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.core.auth import get_current_user
 from app.services.agent.agent_service import AgentService
 from app.services.hubspot.data_sync_service import DataSyncService
-from app.core.dependencies.services import get_agent_service, get_data_sync_service
+from app.core.database import async_session
+from app.core.dependencies.services import build_agent_service, get_agent_service, get_data_sync_service
 
 from .response import (
     AgentResponse,
@@ -42,19 +45,71 @@ async def query_agent(
         )
 
 
+async def query_agent_stream(
+        workspace_id: str,
+        query_request: AgentQueryRequest,
+        current_user: Dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """Send a query to the agent and stream the answer as server-sent events"""
+
+    async def events() -> AsyncIterator[bytes]:
+        # The body is streamed after request dependencies are torn down, so
+        # the agent gets a session owned by this generator
+        async with async_session() as session:
+            stream = build_agent_service(session).process_query_stream(
+                workspace_id=workspace_id,
+                user_id=query_request.user_id,
+                query=query_request.query,
+                conversation_id=query_request.conversation_id
+            )
+            try:
+                async for event in stream:
+                    yield b"data: " + orjson.dumps(event) + b"\n\n"
+            except Exception as e:
+                # Headers are already sent, so errors are reported in-stream
+                yield b"event: error\ndata: " + orjson.dumps({"detail": f"Error processing query: {str(e)}"}) + b"\n\n"
+                return
+            finally:
+                # Runs the stream's own cleanup (storing the answer) even if
+                # the client disconnected
+                await stream.aclose()
+        yield b"event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 async def get_conversation(
         workspace_id: str,
         conversation_id: str,
+        before_created_at: Optional[datetime] = Query(None),
+        before_id: Optional[str] = Query(None),
+        limit: int = Query(50, ge=1, le=200),
         current_user: Dict = Depends(get_current_user),
         agent_service: AgentService = Depends(get_agent_service)
 ) -> ConversationResponse:
-    """Get conversation history"""
+    """
+    Get conversation history, newest page first
+
+    To page back, pass the created_at and id of the oldest message received
+    as `before_created_at` and `before_id`.
+    """
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="before_created_at and before_id must be given together"
+        )
+
     try:
         conversation = await agent_service.repository.get_conversation(conversation_id)
         if not conversation or conversation.workspace_id != workspace_id:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        messages = await agent_service.repository.get_conversation_messages(conversation_id)
+        messages = await agent_service.repository.get_conversation_messages(
+            conversation_id,
+            before_created_at=before_created_at,
+            before_id=before_id,
+            limit=limit
+        )
 
         return transform_conversation_response(
             conversation_id=conversation.id,
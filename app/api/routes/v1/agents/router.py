@@ -31,6 +31,16 @@ router.add_api_route(
     status_code=status.HTTP_200_OK,
 )
 
+# Query the agent, streaming the answer
+router.add_api_route(
+    path="/query/stream",
+    endpoint=endpoints.query_agent_stream,
+    methods=["POST"],
+    summary="Query the agent with a streamed answer",
+    description="Process a natural language query using the agent and stream the final answer as server-sent events",
+    status_code=status.HTTP_200_OK,
+)
+
 # Get conversation history
 router.add_api_route(
     path="/conversations/{conversation_id}",
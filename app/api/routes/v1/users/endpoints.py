@@ -42,7 +42,7 @@ async def list_users(
 ) -> UsersListResponse:
     """Get list of users with optional filtering by account."""
     if account_id:
-        users = await user_service.get_account_users(account_id)
+        users = await user_service.get_all_account_users(account_id)
         total = len(users)  # You might want to get this from the service
     else:
         users = await user_service.get_users(page=page, size=size)
@@ -1,5 +1,5 @@
 import json
-from asyncio.log import logger
+import logging
 from fastapi import HTTPException
 from typing import Dict, List, Optional
 import aiohttp
@@ -11,6 +11,9 @@ from app.models.hubspot import HubspotEngagement, HubspotContact, HubspotAnalyti
     HubspotPipeline, HubspotDeal, HubspotData, HubspotDateField
 
 
+logger = logging.getLogger(__name__)
+
+
 class HubspotClient:
     def __init__(self, access_token: str):
         self.access_token = access_token
@@ -67,7 +70,7 @@ class HubspotClient:
             }
 
         except Exception as e:
-            logger.error(f"Error in HubSpot API call: {str(e)}")
+            logger.exception("Error in HubSpot API call")
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to fetch HubSpot lists: {str(e)}"
@@ -372,7 +375,7 @@ class HubspotClient:
                     )
                     all_deals.append(deal)
                 except Exception as e:
-                    logger.error(f"Error parsing deal {deal_data.get('id')}: {str(e)}")
+                    logger.exception("Error parsing deal %s", deal_data.get('id'))
 
             # Check if there are more pages
             next_page = response.get('paging', {}).get('next', {}).get('after')
@@ -380,9 +383,9 @@ class HubspotClient:
                 break
 
             after = next_page
-            logger.info(f"Fetched {len(all_deals)} deals, getting next batch...")
+            logger.info("Fetched %d deals, getting next batch...", len(all_deals))
 
-        logger.info(f"Fetched a total of {len(all_deals)} deals")
+        logger.info("Fetched a total of %d deals", len(all_deals))
         return all_deals
 
     async def get_all_deals(
@@ -441,7 +444,7 @@ class HubspotClient:
                     )
                     all_deals.append(deal)
                 except Exception as e:
-                    logger.error(f"Error parsing deal {deal_data.get('id')}: {str(e)}")
+                    logger.exception("Error parsing deal %s", deal_data.get('id'))
 
             # Check if there are more pages
             next_page = response.get('paging', {}).get('next', {}).get('after')
@@ -449,7 +452,7 @@ class HubspotClient:
                 break
 
             after = next_page
-            logger.info(f"Fetched {len(all_deals)} deals, getting next batch...")
+            logger.info("Fetched %d deals, getting next batch...", len(all_deals))
 
-        logger.info(f"Fetched a total of {len(all_deals)} deals")
+        logger.info("Fetched a total of %d deals", len(all_deals))
         return all_deals
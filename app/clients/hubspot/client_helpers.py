@@ -1,6 +1,9 @@
+import logging
 from datetime import datetime
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 def parse_date(date_string: Optional[str]) -> Optional[datetime]:
     """
@@ -27,5 +30,5 @@ def parse_date(date_string: Optional[str]) -> Optional[datetime]:
                 return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%SZ")
             except (ValueError, TypeError):
                 # Log the error and return None if all parsing attempts fail
-                print(f"Failed to parse date: {date_string}")
+                logger.warning("Failed to parse date: %s", date_string)
                 return None
@@ -1,10 +1,48 @@
 # app/core/application.py
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from app.core.background import wait_for_background_tasks
 from app.core.config import Settings
+from app.core.database import engine, warm_up_pool
 from app.api.routes.v1.router import router as api_v1_router
 from app.core.middleware.error_handler import ErrorHandlerMiddleware
 
 
+def start_logging() -> QueueListener:
+    """
+    Route application logs through a queue.
+
+    Request handlers only enqueue records; a listener thread formats and
+    writes them, so a slow stdout never blocks the event loop.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener = start_logging()
+    await warm_up_pool()
+    yield
+    await wait_for_background_tasks()
+    await engine.dispose()
+    log_listener.stop()
+
+
 def create_app() -> FastAPI:
     settings = Settings()
 
@@ -15,6 +53,8 @@ def create_app() -> FastAPI:
         # openapi_url=f"{settings.API_V1_STR}/openapi.json",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(ErrorHandlerMiddleware)
@@ -0,0 +1,29 @@
+# app/core/background.py
+import asyncio
+import logging
+from typing import Awaitable, Set
+
+logger = logging.getLogger(__name__)
+
+# Strong references to running tasks; the event loop only keeps weak ones
+_tasks: Set[asyncio.Task] = set()
+
+
+def run_in_background(awaitable: Awaitable, description: str) -> asyncio.Task:
+    """Run an awaitable after the response is sent; failures are logged, not raised."""
+    async def runner():
+        try:
+            await awaitable
+        except Exception:
+            logger.exception("Background task failed: %s", description)
+
+    task = asyncio.create_task(runner())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def wait_for_background_tasks() -> None:
+    """Wait for pending background tasks, e.g. before shutting down."""
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
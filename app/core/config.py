@@ -8,6 +8,8 @@ import json
 import logging
 import logging.config
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     # App Settings
@@ -27,6 +29,9 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
 
     # HubSpot
     HUBSPOT_CLIENT_ID: Optional[str] = None
@@ -115,11 +120,11 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     """Get cached settings instance."""
     settings = Settings()
-    print("DEBUG: Environment variables loaded:")
-    print(f"HUBSPOT_CLIENT_ID: {settings.HUBSPOT_CLIENT_ID}")
-    print(f"HUBSPOT_APP_ID: {settings.HUBSPOT_APP_ID}")
-    print(f"HUBSPOT_CLIENT_SECRET: {settings.HUBSPOT_CLIENT_SECRET}")
-    print(f"HUBSPOT_REDIRECT_URI: {settings.HUBSPOT_REDIRECT_URI}")
+    logger.debug("Environment variables loaded")
+    logger.debug("HUBSPOT_CLIENT_ID: %s", settings.HUBSPOT_CLIENT_ID)
+    logger.debug("HUBSPOT_APP_ID: %s", settings.HUBSPOT_APP_ID)
+    logger.debug("HUBSPOT_CLIENT_SECRET set: %s", bool(settings.HUBSPOT_CLIENT_SECRET))
+    logger.debug("HUBSPOT_REDIRECT_URI: %s", settings.HUBSPOT_REDIRECT_URI)
     return settings
 
 
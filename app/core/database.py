@@ -1,4 +1,8 @@
-from typing import AsyncGenerator
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncGenerator
+from pgvector import Vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -6,9 +10,50 @@ from app.core.config import settings
 engine = create_async_engine(
     settings.RETURN_DATABASE_URL,
     echo=False,  # Set to True for SQL query logging
-    future=True
+    future=True,
+    insertmanyvalues_page_size=1000,  # Rows per batched multi-row INSERT
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=False,  # Dead connections are invalidated on error; pool_recycle retires old ones
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        # JIT compilation only pays off for long analytical queries
+        "server_settings": {"jit": "off"},
+        "prepared_statement_cache_size": 1024
+    }
 )
 
+
+
+def _encode_vector(value: Any) -> bytes:
+    # SQLAlchemy's Vector type binds the text form; raw asyncpg callers pass arrays
+    if isinstance(value, str):
+        value = Vector.from_text(value)
+    elif not isinstance(value, Vector):
+        value = Vector(value)
+    return value.to_binary()
+
+
+async def _register_vector_codec(connection) -> None:
+    try:
+        await connection.set_type_codec(
+            "vector",
+            schema="public",
+            encoder=_encode_vector,
+            decoder=Vector.from_binary,
+            format="binary"
+        )
+    except ValueError:
+        # pgvector extension not installed yet (e.g. before the first migration)
+        pass
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record) -> None:
+    """Send and receive vectors in pgvector's binary format."""
+    dbapi_connection.run_async(_register_vector_codec)
+
+
 async_session = sessionmaker(
     bind=engine,
     expire_on_commit=False,
@@ -23,3 +68,12 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def warm_up_pool() -> None:
+    """Open pool_size connections up front so early requests skip connection setup."""
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(
+            stack.enter_async_context(engine.connect())
+            for _ in range(settings.DB_POOL_SIZE)
+        ))
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from fastapi import Depends
 from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +9,7 @@ from app.core.database import get_session
 from app.repositories.agent.agent_repository import AgentRepository
 from app.repositories.hubspot.deal_repository import DealRepository
 from app.services.account.account_service import AccountService
+from app.services.agent.action_cache import ActionCache
 from app.services.agent.agent_service import AgentService
 from app.services.agent.tools.deal_analysis import DealAnalysisTool
 from app.services.agent.tools.tool_registry import ToolRegistry
@@ -68,9 +71,18 @@ def get_deal_repository(
     return DealRepository(db)
 
 
-def get_openai_client():
-    from openai import AsyncOpenAI
-    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+@lru_cache()
+def get_openai_client() -> AsyncOpenAI:
+    """Process-wide OpenAI client so its HTTP connection pool is reused across requests."""
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY
+    )
+
+
+@lru_cache()
+def get_action_cache() -> ActionCache:
+    """Process-wide cache of LLM agent actions."""
+    return ActionCache()
 
 
 # def get_analytics_processor() -> AnalyticsProcessor:
@@ -115,12 +127,6 @@ def get_vector_service(
     )
 
 
-def get_openai_client() -> AsyncOpenAI:
-    return AsyncOpenAI(
-        api_key=settings.OPENAI_API_KEY
-    )
-
-
 def get_llm_service(
         openai_client: AsyncOpenAI = Depends(get_openai_client)
 ) -> LLMService:
@@ -146,13 +152,35 @@ def get_agent_service(
         db: AsyncSession = Depends(get_session),
         repository: AgentRepository = Depends(get_agent_repository),
         tool_registry: ToolRegistry = Depends(get_tool_registry),
-        llm_service: LLMService = Depends(get_llm_service)
+        llm_service: LLMService = Depends(get_llm_service),
+        action_cache: ActionCache = Depends(get_action_cache)
 ) -> AgentService:
     return AgentService(
         db=db,
         repository=repository,
         tool_registry=tool_registry,
-        llm_service=llm_service
+        llm_service=llm_service,
+        action_cache=action_cache
+    )
+
+
+def build_agent_service(db: AsyncSession) -> AgentService:
+    """
+    Build an AgentService on a session the caller owns.
+
+    For streaming responses, whose body runs after request dependencies
+    (and their sessions) have been torn down.
+    """
+    openai_client = get_openai_client()
+    return get_agent_service(
+        db=db,
+        repository=get_agent_repository(db),
+        tool_registry=get_tool_registry(
+            vector_service=get_vector_service(db, get_vector_repository(db), openai_client),
+            deal_repository=get_deal_repository(db)
+        ),
+        llm_service=get_llm_service(openai_client),
+        action_cache=get_action_cache()
     )
 
 
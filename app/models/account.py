@@ -3,7 +3,7 @@ from enum import Enum
 
 from app.models.plan import Plan
 from app.models.base import Base
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 
 
@@ -24,3 +24,12 @@ class Account(Base):
     plan_started_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            'idx_accounts_status',
+            subscription_status,
+            postgresql_include=['id', 'name', 'active_plan_id']
+        ),
+        Index('idx_accounts_plan', active_plan_id),
+    )
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 
@@ -14,6 +15,12 @@ class Conversation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), nullable=True)
 
+    messages = relationship(
+        "ConversationMessage",
+        back_populates="conversation",
+        order_by="ConversationMessage.created_at"
+    )
+
 
 class ConversationMessage(Base):
     __tablename__ = "conversation_messages"
@@ -24,14 +31,27 @@ class ConversationMessage(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    conversation = relationship("Conversation", back_populates="messages")
+
+    __table_args__ = (
+        Index('idx_conversation_messages_conversation_created', conversation_id, created_at, id),
+    )
+
 
 @dataclass
 class AgentState:
+    """State of one ReAct run; slotted since it is read on every step"""
+    __slots__ = (
+        "query", "workspace_id", "user_id", "conversation_id",
+        "tools", "tools_text", "thoughts", "actions", "final_answer"
+    )
+
     query: str
     workspace_id: str
     user_id: str
     conversation_id: str
     tools: List[Dict[str, str]]
-    thoughts: Dict[str, str]
-    actions: Dict[str, str]
-    final_answer: str
+    tools_text: str
+    thoughts: List[str]
+    actions: List[Dict[str, Any]]
+    final_answer: Optional[str]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from app.models.base import Base
 
@@ -18,6 +18,16 @@ class Hubspot(Base):
     hubspot_portal_id = Column(String, nullable=False)
     account_name = Column(String)
 
+    __table_args__ = (
+        # At most one active credential per workspace
+        Index(
+            'idx_hubspots_workspace_active',
+            workspace_id,
+            unique=True,
+            postgresql_where=text('is_active = true')
+        ),
+    )
+
     def __repr__(self):
         """Better representation for debugging"""
         return (f"Hubspot(id={self.id}, "
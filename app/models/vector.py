@@ -1,9 +1,9 @@
 from enum import Enum
 
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Text, Index, func
+from sqlalchemy import Column, Computed, String, Integer, ForeignKey, DateTime, Text, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import expression
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import Vector, BIT
 
 from app.models.base import Base
 
@@ -42,7 +42,7 @@ class DocumentStore(Base):
     __tablename__ = "document_store"
 
     id = Column(String, primary_key=True, default=generate_document_id)
-    workspace_id = Column(String, ForeignKey("workspaces.id"), nullable=False, index=True)
+    workspace_id = Column(String, ForeignKey("workspaces.id"), nullable=False)
     filename = Column(String, nullable=False)
     document_type = Column(String, nullable=False)
     content_type = Column(String, nullable=False)
@@ -56,6 +56,21 @@ class DocumentStore(Base):
     deleted_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(String, nullable=False)
 
+    __table_args__ = (
+        Index(
+            'idx_document_store_metadata_gin',
+            document_metadata,
+            postgresql_using='gin',
+            postgresql_ops={'document_metadata': 'jsonb_path_ops'}
+        ),
+        Index(
+            'idx_document_store_workspace_upload',
+            workspace_id,
+            upload_date.desc(),
+            postgresql_include=['id', 'filename', 'status', 'document_type']
+        ),
+    )
+
     def __repr__(self):
         return f"<DocumentStore(id='{self.id}', filename='{self.filename}', status='{self.status}')>"
 
@@ -73,6 +88,12 @@ class DocumentChunk(Base):
 
     __table_args__ = (
         Index('idx_document_chunk_index', 'document_id', 'chunk_index', unique=True),
+        Index(
+            'idx_document_chunks_metadata_gin',
+            chunk_metadata,
+            postgresql_using='gin',
+            postgresql_ops={'chunk_metadata': 'jsonb_path_ops'}
+        ),
     )
 
     def __repr__(self):
@@ -86,8 +107,20 @@ class DocumentEmbedding(Base):
     id = Column(String, primary_key=True, default=generate_document_embedding_id)
     chunk_id = Column(String, ForeignKey("document_chunks.id"), nullable=False, unique=True, index=True)
     embedding = Column(Vector(1536))
+    # Sign-bit sketch for the first (index) stage of similarity search
+    embedding_bits = Column(BIT(1536), Computed("binary_quantize(embedding)::bit(1536)", persisted=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # Copied from the owning document by database triggers so search can filter
+    # without joining chunks and documents; never written by the application
+    workspace_id = Column(String, nullable=True)
+    document_status = Column(String, nullable=True)
+    document_type = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index('idx_document_embeddings_workspace_status', 'workspace_id', 'document_status'),
+    )
+
     def __repr__(self):
         return f"<DocumentEmbedding(id='{self.id}', chunk_id='{self.chunk_id}')>"
 
@@ -97,11 +130,15 @@ class EmbeddingSearch(Base):
     __tablename__ = "embedding_searches"
 
     id = Column(String, primary_key=True, default=generate_embedding_search_id)
-    workspace_id = Column(String, ForeignKey("workspaces.id"), nullable=False, index=True)
+    workspace_id = Column(String, ForeignKey("workspaces.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=True)
     query = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     search_metadata = Column(JSONB, nullable=False, server_default=expression.text("'{}'::jsonb"))
 
+    __table_args__ = (
+        Index('idx_embedding_searches_workspace_created', workspace_id, created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<EmbeddingSearch(id='{self.id}', query='{self.query[:20]}...')>"
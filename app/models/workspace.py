@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 
 from app.models.base import Base
@@ -15,5 +15,14 @@ class Workspace(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
     updated_at = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        Index(
+            'idx_workspaces_account_active',
+            account_id,
+            postgresql_include=['id', 'slug', 'name'],
+            postgresql_where=text('deleted_at IS NULL')
+        ),
+    )
+
     def __repr__(self):
         return f"<Workspace(id='{self.id}', name='{self.name}', slug='{self.slug}')>"
@@ -1,8 +1,12 @@
 # app/repositories/agent/agent_repository.py
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, lambda_stmt, tuple_
+from sqlalchemy.orm import raiseload
 
-from app.core.id_generator.id_generator import generate_conversation_id
+from app.core.id_generator.id_generator import generate_conversation_id, generate_conversation_message_id
 from app.models.agent import Conversation, ConversationMessage
 
 
@@ -16,40 +20,83 @@ class AgentRepository:
     async def create_conversation(
             self,
             workspace_id: str,
-            user_id: str
+            user_id: str,
+            conversation_id: Optional[str] = None
     ) -> Conversation:
-        """Create a new conversation"""
+        """Create a new conversation; does not commit, run it inside the caller's transaction"""
         conversation = Conversation(
-            id=generate_conversation_id(),
+            id=conversation_id or generate_conversation_id(),
             workspace_id=workspace_id,
             user_id=user_id
         )
         self.db.add(conversation)
-        await self.db.commit()
-        await self.db.refresh(conversation)
+        await self.db.flush()
         return conversation
 
     async def get_conversation(
             self,
             conversation_id: str
     ) -> Conversation:
-        """Get a conversation by ID"""
+        """
+        Get a conversation by ID
+
+        Relationship access raises instead of lazy loading; use
+        get_conversation_messages for the messages.
+        """
         result = await self.db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
+            lambda_stmt(
+                lambda: select(Conversation)
+                .where(Conversation.id == conversation_id)
+                .options(raiseload("*"))
+            )
         )
         return result.scalars().first()
 
     async def get_conversation_messages(
+            self,
+            conversation_id: str,
+            before_created_at: Optional[datetime] = None,
+            before_id: Optional[str] = None,
+            limit: int = 50
+    ) -> List[ConversationMessage]:
+        """
+        Get the latest messages of a conversation, oldest first
+
+        Keyset paginated on (created_at, id): pass the created_at and id of the
+        oldest message already seen as `before_created_at` and `before_id` to
+        fetch the previous page. Messages written in one transaction share a
+        created_at, so the id breaks the tie.
+        """
+        stmt = (
+            select(ConversationMessage)
+            .where(ConversationMessage.conversation_id == conversation_id)
+            .order_by(ConversationMessage.created_at.desc(), ConversationMessage.id.desc())
+            .limit(limit)
+            .options(raiseload("*"))
+        )
+        if before_created_at is not None and before_id is not None:
+            stmt = stmt.where(
+                tuple_(ConversationMessage.created_at, ConversationMessage.id)
+                < tuple_(before_created_at, before_id)
+            )
+
+        result = await self.db.execute(stmt)
+        messages = result.scalars().all()
+        return list(reversed(messages))
+
+    async def iter_conversation_messages(
             self,
             conversation_id: str
-    ):
-        """Get all messages for a conversation ordered by creation time"""
-        result = await self.db.execute(
+    ) -> AsyncIterator[ConversationMessage]:
+        """Stream all messages for a conversation ordered by creation time"""
+        result = await self.db.stream_scalars(
             select(ConversationMessage)
             .where(ConversationMessage.conversation_id == conversation_id)
-            .order_by(ConversationMessage.created_at)
+            .order_by(ConversationMessage.created_at, ConversationMessage.id)
+            .options(raiseload("*"))
         )
-        return result.scalars().all()
+        async for message in result:
+            yield message
 
     async def add_message(
             self,
@@ -66,5 +113,31 @@ class AgentRepository:
         )
         self.db.add(message)
         await self.db.commit()
-        await self.db.refresh(message)
         return message
+
+    async def add_messages(
+            self,
+            conversation_id: str,
+            messages: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Add several messages to a conversation with one multi-row INSERT
+
+        Each message is a dict with role, content and optionally created_at
+        (given for all messages or none); pass created_at when messages written
+        together must keep their order. Returns the new message IDs. Does not commit: run it inside the
+        caller's transaction.
+        """
+        result = await self.db.execute(
+            insert(ConversationMessage.__table__)
+            .values([
+                {
+                    "id": generate_conversation_message_id(),
+                    "conversation_id": conversation_id,
+                    **message
+                }
+                for message in messages
+            ])
+            .returning(ConversationMessage.__table__.c.id)
+        )
+        return list(result.scalars())
@@ -0,0 +1,40 @@
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+
+class DealAnalysisCache:
+    """
+    Short-lived per-workspace cache of data derived from deal snapshots.
+
+    Entries expire after `ttl` seconds and are dropped when the workspace's
+    deals are written. A per-workspace generation counter lets callers discard
+    values loaded concurrently with a write.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: int = 60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = defaultdict(int)
+
+    def generation(self, workspace_id: str) -> int:
+        """Current generation of a workspace; pass it back to set()."""
+        return self._generations[workspace_id]
+
+    def get(self, workspace_id: str) -> Optional[Any]:
+        """Get the cached value for a workspace, or None on a miss."""
+        return self._cache.get(workspace_id)
+
+    def set(self, workspace_id: str, generation: int, value: Any) -> None:
+        """Store a value loaded at `generation`; stale loads are discarded."""
+        if generation == self._generations[workspace_id]:
+            self._cache[workspace_id] = value
+
+    def invalidate_workspace(self, workspace_id: str) -> None:
+        """Drop the cached value for a workspace."""
+        self._generations[workspace_id] += 1
+        self._cache.pop(workspace_id, None)
+
+
+# Shared across requests; repositories are created per request
+deal_analysis_cache = DealAnalysisCache()
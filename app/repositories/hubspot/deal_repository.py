@@ -1,8 +1,9 @@
 # app/repositories/crm/deal_repository.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List, Dict, Any, Optional
+from sqlalchemy import select, func, insert, tuple_, text, lambda_stmt, RowMapping
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from app.models.deal_data import DealSnapshot
+from app.repositories.hubspot.deal_cache import deal_analysis_cache
 
 class DealRepository:
     def __init__(self, db: AsyncSession):
@@ -12,16 +13,28 @@ class DealRepository:
         """
         Insert or update multiple deal snapshots
 
-        For each deal, check if it exists (by workspace_id and external_id)
-        If it exists, update it; if not, insert a new record
+        Existing deals (matched by workspace_id and external_id) are loaded in a
+        single query and updated in place; new deals are written with one
+        multi-row INSERT so the driver can batch them via insertmanyvalues.
         """
+        if not deal_data_list:
+            return []
+
+        # One row per (workspace_id, external_id), the last one winning, so a
+        # repeated deal updates instead of being inserted twice
+        deal_data_list = list({
+            (d["workspace_id"], d["external_id"]): d
+            for d in deal_data_list
+        }.values())
+
+        existing_deals = await self._get_deals_by_external_ids(deal_data_list)
+
         result_deals = []
+        to_insert = []
 
         for deal_data in deal_data_list:
-            # Check if deal exists
-            existing_deal = await self.get_deal_by_external_id(
-                deal_data["workspace_id"],
-                deal_data["external_id"]
+            existing_deal = existing_deals.get(
+                (deal_data["workspace_id"], deal_data["external_id"])
             )
 
             if existing_deal:
@@ -31,20 +44,40 @@ class DealRepository:
                         setattr(existing_deal, key, value)
                 result_deals.append(existing_deal)
             else:
-                # Create new deal
-                new_deal = DealSnapshot(**deal_data)
-                self.db.add(new_deal)
-                result_deals.append(new_deal)
+                to_insert.append(deal_data)
+
+        if to_insert:
+            result = await self.db.scalars(
+                insert(DealSnapshot).returning(DealSnapshot),
+                to_insert
+            )
+            result_deals.extend(result.all())
 
         # Commit all changes
         await self.db.commit()
 
-        # Refresh all deals to get updated data
-        for deal in result_deals:
-            await self.db.refresh(deal)
+        for workspace_id in {d["workspace_id"] for d in deal_data_list}:
+            deal_analysis_cache.invalidate_workspace(workspace_id)
 
         return result_deals
 
+    async def _get_deals_by_external_ids(
+            self,
+            deal_data_list: List[Dict[str, Any]]
+    ) -> Dict[Tuple[str, str], DealSnapshot]:
+        """Load the deals matching the given input rows, keyed by (workspace_id, external_id)"""
+        keys = {(d["workspace_id"], d["external_id"]) for d in deal_data_list}
+
+        result = await self.db.execute(
+            select(DealSnapshot).where(
+                tuple_(DealSnapshot.workspace_id, DealSnapshot.external_id).in_(keys)
+            )
+        )
+        return {
+            (deal.workspace_id, deal.external_id): deal
+            for deal in result.scalars().all()
+        }
+
     async def get_deal_by_external_id(
             self,
             workspace_id: str,
@@ -52,9 +85,11 @@ class DealRepository:
     ) -> Optional[DealSnapshot]:
         """Get a deal by its external ID and workspace ID"""
         result = await self.db.execute(
-            select(DealSnapshot).where(
-                DealSnapshot.workspace_id == workspace_id,
-                DealSnapshot.external_id == external_id
+            lambda_stmt(
+                lambda: select(DealSnapshot).where(
+                    DealSnapshot.workspace_id == workspace_id,
+                    DealSnapshot.external_id == external_id
+                )
             )
         )
         return result.scalars().first()
@@ -80,32 +115,76 @@ class DealRepository:
         result = await self.db.execute(query)
         return result.scalars().all()
 
-    async def get_pipeline_stages(self, workspace_id: str) -> Dict[str, List[Dict]]:
-        """
-        Get all unique pipeline and stage combinations for a workspace
-        Returns a dictionary of pipelines with their stages
+    async def get_deal_rows(self, workspace_id: str) -> Sequence[RowMapping]:
         """
-        # Get all distinct pipeline_id, stage_id, stage_name combinations
-        query = select(
-            DealSnapshot.pipeline_id,
-            DealSnapshot.stage_id,
-            DealSnapshot.stage_name
-        ).where(
-            DealSnapshot.workspace_id == workspace_id
-        ).distinct()
+        Get the analysis columns of a workspace's deals as plain row mappings
 
-        result = await self.db.execute(query)
-        rows = result.all()
+        Selecting only these columns skips ORM object construction; rows are
+        ordered like get_deals_by_workspace.
+        """
+        result = await self.db.execute(
+            select(
+                DealSnapshot.id,
+                DealSnapshot.name,
+                DealSnapshot.amount,
+                DealSnapshot.pipeline_id,
+                DealSnapshot.stage_id,
+                DealSnapshot.stage_name,
+                DealSnapshot.close_date,
+                DealSnapshot.probability,
+                DealSnapshot.days_in_stage
+            )
+            .where(DealSnapshot.workspace_id == workspace_id)
+            .order_by(DealSnapshot.sync_date.desc())
+        )
+        return result.mappings().all()
 
-        # Organize by pipeline
-        pipelines = {}
-        for pipeline_id, stage_id, stage_name in rows:
-            if pipeline_id not in pipelines:
-                pipelines[pipeline_id] = []
+    async def get_stalled_deals(self, workspace_id: str, min_days: int = 30) -> Sequence[RowMapping]:
+        """Get the deals in their stage for more than `min_days` days, longest first"""
+        result = await self.db.execute(
+            select(
+                DealSnapshot.id,
+                DealSnapshot.name,
+                DealSnapshot.amount,
+                DealSnapshot.stage_name,
+                DealSnapshot.days_in_stage,
+                DealSnapshot.probability
+            )
+            .where(
+                DealSnapshot.workspace_id == workspace_id,
+                DealSnapshot.days_in_stage > min_days
+            )
+            .order_by(DealSnapshot.days_in_stage.desc(), DealSnapshot.sync_date.desc())
+        )
+        return result.mappings().all()
 
-            pipelines[pipeline_id].append({
-                "id": stage_id,
-                "name": stage_name
-            })
+    async def count_deals(self, workspace_id: str) -> int:
+        """Count the deals of a workspace"""
+        return await self.db.scalar(
+            select(func.count()).select_from(DealSnapshot).where(DealSnapshot.workspace_id == workspace_id)
+        )
 
-        return pipelines
\ No newline at end of file
+    async def get_pipeline_stages(self, workspace_id: str) -> Dict[str, List[Dict]]:
+        """
+        Get all unique pipeline and stage combinations for a workspace
+        Returns a dictionary of pipelines with their stages, built in a single
+        jsonb aggregate row (deals without a pipeline are skipped)
+        """
+        query = text("""
+            SELECT jsonb_object_agg(pipeline_id, stages)
+            FROM (
+                SELECT
+                    pipeline_id,
+                    jsonb_agg(jsonb_build_object('id', stage_id, 'name', stage_name)) AS stages
+                FROM (
+                    SELECT DISTINCT pipeline_id, stage_id, stage_name
+                    FROM deal_snapshots
+                    WHERE workspace_id = :workspace_id
+                      AND pipeline_id IS NOT NULL
+                ) s
+                GROUP BY pipeline_id
+            ) p
+        """)
+
+        result = await self.db.execute(query, {"workspace_id": workspace_id})
+        return result.scalar() or {}
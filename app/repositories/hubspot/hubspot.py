@@ -1,33 +1,72 @@
-from typing import Optional
+from typing import Optional, List, Dict, Any
 
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, inspect, lambda_stmt
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.models.hubspot import Hubspot
 
+# Active credentials per workspace, stored as plain column values so entries
+# are not tied to the session that loaded them. Per process; tokens refresh
+# roughly hourly so a short TTL keeps this in step with the database.
+_credentials_cache = TTLCache(maxsize=1024, ttl=60)
+
 
 class HubspotRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_hubspot_record(self, credentials: Hubspot) -> Hubspot:
-        """Create new HubSpot credentials."""
+        """Create new HubSpot credentials, deactivating any previously active ones."""
+        await self.db.execute(
+            update(Hubspot)
+            .where(Hubspot.workspace_id == credentials.workspace_id)
+            .where(Hubspot.is_active == True)
+            .values(is_active=False)
+        )
         self.db.add(credentials)
         await self.db.commit()
-        await self.db.refresh(credentials)
+        _credentials_cache.pop(credentials.workspace_id, None)
         return credentials
 
     async def get_hubspot_record(self, workspace_id: str) -> Optional[Hubspot]:
         """Get active credentials for a user."""
-        stmt = (
-            select(Hubspot)
+        cached = _credentials_cache.get(workspace_id)
+        if cached is not None:
+            credentials = Hubspot(**cached)
+            make_transient_to_detached(credentials)
+            return await self.db.merge(credentials, load=False)
+
+        stmt = lambda_stmt(
+            lambda: select(Hubspot)
             .where(Hubspot.workspace_id == workspace_id)
             .where(Hubspot.is_active == True)
         )
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()  # Changed from one_or_none()
+        credentials = result.scalar_one_or_none()  # Changed from one_or_none()
+
+        if credentials is not None:
+            _credentials_cache[workspace_id] = {
+                attr.key: getattr(credentials, attr.key)
+                for attr in inspect(Hubspot).column_attrs
+            }
+        return credentials
 
     async def update_hubspot_record(self, credentials: Hubspot) -> Hubspot:
         """Update existing credentials."""
         await self.db.commit()
+        _credentials_cache.pop(credentials.workspace_id, None)
         return credentials
+
+    async def bulk_update_hubspot_records(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Update many credential records in one batch (e.g. token refresh jobs).
+
+        Each row holds the record "id" plus the columns to change.
+        """
+        if not rows:
+            return
+        await self.db.execute(update(Hubspot), rows)
+        await self.db.commit()
+        _credentials_cache.clear()
@@ -0,0 +1,98 @@
+"""copy workspace, status and type of the owning document onto document_embeddings
+
+Revision ID: 0c4e9a7b5d21
+Revises: f3a8b6e1c072
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0c4e9a7b5d21'
+down_revision: Union[str, None] = 'f3a8b6e1c072'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('document_embeddings', sa.Column('workspace_id', sa.String(), nullable=True))
+    op.add_column('document_embeddings', sa.Column('document_status', sa.String(), nullable=True))
+    op.add_column('document_embeddings', sa.Column('document_type', sa.String(), nullable=True))
+
+    # Backfill existing rows
+    op.execute("""
+        UPDATE document_embeddings de
+        SET workspace_id = ds.workspace_id,
+            document_status = ds.status,
+            document_type = ds.document_type
+        FROM document_chunks dc
+        JOIN document_store ds ON dc.document_id = ds.id
+        WHERE de.chunk_id = dc.id
+    """)
+
+    # New embeddings pick the values up from their document
+    op.execute("""
+        CREATE FUNCTION document_embeddings_copy_document_fields() RETURNS trigger AS $$
+        BEGIN
+            SELECT ds.workspace_id, ds.status, ds.document_type
+            INTO NEW.workspace_id, NEW.document_status, NEW.document_type
+            FROM document_chunks dc
+            JOIN document_store ds ON dc.document_id = ds.id
+            WHERE dc.id = NEW.chunk_id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_document_embeddings_copy_document_fields
+        BEFORE INSERT OR UPDATE OF chunk_id ON document_embeddings
+        FOR EACH ROW EXECUTE FUNCTION document_embeddings_copy_document_fields()
+    """)
+
+    # Document changes are pushed down to its embeddings
+    op.execute("""
+        CREATE FUNCTION document_store_sync_embedding_fields() RETURNS trigger AS $$
+        BEGIN
+            UPDATE document_embeddings de
+            SET workspace_id = NEW.workspace_id,
+                document_status = NEW.status,
+                document_type = NEW.document_type
+            FROM document_chunks dc
+            WHERE de.chunk_id = dc.id
+              AND dc.document_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_document_store_sync_embedding_fields
+        AFTER UPDATE OF workspace_id, status, document_type ON document_store
+        FOR EACH ROW
+        WHEN (
+            OLD.workspace_id IS DISTINCT FROM NEW.workspace_id
+            OR OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.document_type IS DISTINCT FROM NEW.document_type
+        )
+        EXECUTE FUNCTION document_store_sync_embedding_fields()
+    """)
+
+    op.create_index(
+        'idx_document_embeddings_workspace_status',
+        'document_embeddings',
+        ['workspace_id', 'document_status'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_document_embeddings_workspace_status', table_name='document_embeddings')
+    op.execute("DROP TRIGGER IF EXISTS trg_document_store_sync_embedding_fields ON document_store")
+    op.execute("DROP FUNCTION IF EXISTS document_store_sync_embedding_fields()")
+    op.execute("DROP TRIGGER IF EXISTS trg_document_embeddings_copy_document_fields ON document_embeddings")
+    op.execute("DROP FUNCTION IF EXISTS document_embeddings_copy_document_fields()")
+    op.drop_column('document_embeddings', 'document_type')
+    op.drop_column('document_embeddings', 'document_status')
+    op.drop_column('document_embeddings', 'workspace_id')
@@ -10,6 +10,7 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
+from pgvector.sqlalchemy import Vector
 
 # revision identifiers, used by Alembic.
 revision: str = '20250302_vector_db_tables'
@@ -64,17 +65,13 @@ def upgrade() -> None:
         'document_embeddings',
         sa.Column('id', sa.String(), nullable=False),
         sa.Column('chunk_id', sa.String(), nullable=False),
-        # Using text directly for the vector column since SQLAlchemy doesn't support it natively
-        sa.Column('embedding', sa.Text(), nullable=True),
+        sa.Column('embedding', Vector(1536), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['chunk_id'], ['document_chunks.id'], name=op.f('fk_document_embeddings_chunk_id_document_chunks')),
         sa.PrimaryKeyConstraint('id', name=op.f('pk_document_embeddings'))
     )
     op.create_index(op.f('ix_document_embeddings_chunk_id'), 'document_embeddings', ['chunk_id'], unique=True)
 
-    # Alter the embedding column to use the vector type
-    op.execute('ALTER TABLE document_embeddings ALTER COLUMN embedding TYPE vector(1536) USING embedding::vector(1536);')
-
     # Create embedding_searches table
     op.create_table(
         'embedding_searches',
@@ -90,8 +87,8 @@ def upgrade() -> None:
     )
     op.create_index(op.f('ix_embedding_searches_workspace_id'), 'embedding_searches', ['workspace_id'], unique=False)
 
-    # Create an index on the embedding column for faster cosine similarity searches
-    op.execute('CREATE INDEX idx_document_embeddings_embedding ON document_embeddings USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);')
+    # Create an HNSW index on the embedding column for faster cosine similarity searches (pgvector >= 0.5.0)
+    op.execute('CREATE INDEX idx_document_embeddings_embedding ON document_embeddings USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);')
 
 
 def downgrade() -> None:
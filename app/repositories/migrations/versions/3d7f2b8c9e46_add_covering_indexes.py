@@ -0,0 +1,55 @@
+"""add covering indexes for account, workspace and document listings
+
+Revision ID: 3d7f2b8c9e46
+Revises: 0c4e9a7b5d21
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7f2b8c9e46'
+down_revision: Union[str, None] = '0c4e9a7b5d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_accounts_status',
+        'accounts',
+        ['subscription_status'],
+        unique=False,
+        postgresql_include=['id', 'name', 'active_plan_id']
+    )
+    op.create_index('idx_accounts_plan', 'accounts', ['active_plan_id'], unique=False)
+
+    op.create_index(
+        'idx_workspaces_account_active',
+        'workspaces',
+        ['account_id'],
+        unique=False,
+        postgresql_include=['id', 'slug', 'name'],
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+
+    # Serves the paginated document listing; supersedes the plain workspace_id index
+    op.create_index(
+        'idx_document_store_workspace_upload',
+        'document_store',
+        ['workspace_id', sa.text('upload_date DESC')],
+        unique=False,
+        postgresql_include=['id', 'filename', 'status', 'document_type']
+    )
+    op.drop_index('ix_document_store_workspace_id', table_name='document_store')
+
+
+def downgrade() -> None:
+    op.create_index('ix_document_store_workspace_id', 'document_store', ['workspace_id'], unique=False)
+    op.drop_index('idx_document_store_workspace_upload', table_name='document_store')
+    op.drop_index('idx_workspaces_account_active', table_name='workspaces')
+    op.drop_index('idx_accounts_plan', table_name='accounts')
+    op.drop_index('idx_accounts_status', table_name='accounts')
@@ -0,0 +1,31 @@
+"""add conversation_messages (conversation_id, created_at, id) index
+
+Revision ID: 5f2a9c81d3e4
+Revises: c33a67b822c7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2a9c81d3e4'
+down_revision: Union[str, None] = 'c33a67b822c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves keyset pagination of a conversation's messages by (created_at, id)
+    op.create_index(
+        'idx_conversation_messages_conversation_created',
+        'conversation_messages',
+        ['conversation_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conversation_messages_conversation_created', table_name='conversation_messages')
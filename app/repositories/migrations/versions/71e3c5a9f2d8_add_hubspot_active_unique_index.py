@@ -0,0 +1,44 @@
+"""add partial unique index on active hubspot credentials
+
+Revision ID: 71e3c5a9f2d8
+Revises: d94f0b2a6c15
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '71e3c5a9f2d8'
+down_revision: Union[str, None] = 'd94f0b2a6c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the most recent active credential per workspace before enforcing uniqueness
+    op.execute("""
+        UPDATE hubspots h
+        SET is_active = false
+        WHERE h.is_active = true
+          AND EXISTS (
+              SELECT 1 FROM hubspots newer
+              WHERE newer.workspace_id = h.workspace_id
+                AND newer.is_active = true
+                AND (newer.created_at, newer.id) > (h.created_at, h.id)
+          )
+    """)
+
+    op.create_index(
+        'idx_hubspots_workspace_active',
+        'hubspots',
+        ['workspace_id'],
+        unique=True,
+        postgresql_where=sa.text('is_active = true')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_hubspots_workspace_active', table_name='hubspots')
@@ -0,0 +1,34 @@
+"""add embedding_searches (workspace_id, created_at DESC) index
+
+Revision ID: 8b3e6d0f4a17
+Revises: 5f2a9c81d3e4
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e6d0f4a17'
+down_revision: Union[str, None] = '5f2a9c81d3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Recent searches per workspace become an index scan that stops after LIMIT rows;
+    # the composite index also covers plain workspace_id lookups
+    op.create_index(
+        'idx_embedding_searches_workspace_created',
+        'embedding_searches',
+        ['workspace_id', sa.text('created_at DESC')],
+        unique=False
+    )
+    op.drop_index('ix_embedding_searches_workspace_id', table_name='embedding_searches')
+
+
+def downgrade() -> None:
+    op.create_index('ix_embedding_searches_workspace_id', 'embedding_searches', ['workspace_id'], unique=False)
+    op.drop_index('idx_embedding_searches_workspace_created', table_name='embedding_searches')
@@ -0,0 +1,45 @@
+"""rebuild document_embeddings HNSW index with m=24, ef_construction=128
+
+Revision ID: a6f1d8e3b920
+Revises: 71e3c5a9f2d8
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f1d8e3b920'
+down_revision: Union[str, None] = '71e3c5a9f2d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block; building the new index
+    # before dropping the old one keeps searches indexed throughout
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute("SET max_parallel_maintenance_workers = 7")
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doc_emb_hnsw
+            ON document_embeddings
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 24, ef_construction = 128)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_document_embeddings_embedding")
+        op.execute("RESET max_parallel_maintenance_workers")
+        op.execute("RESET maintenance_work_mem")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_embeddings_embedding
+            ON document_embeddings
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_doc_emb_hnsw")
@@ -0,0 +1,42 @@
+"""add jsonb_path_ops GIN indexes on document and chunk metadata
+
+Revision ID: d94f0b2a6c15
+Revises: 8b3e6d0f4a17
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94f0b2a6c15'
+down_revision: Union[str, None] = '8b3e6d0f4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only supports containment (@>) but is smaller and faster than jsonb_ops
+    op.create_index(
+        'idx_document_store_metadata_gin',
+        'document_store',
+        ['document_metadata'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'document_metadata': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'idx_document_chunks_metadata_gin',
+        'document_chunks',
+        ['chunk_metadata'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'chunk_metadata': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_document_chunks_metadata_gin', table_name='document_chunks')
+    op.drop_index('idx_document_store_metadata_gin', table_name='document_store')
@@ -0,0 +1,54 @@
+"""add generated halfvec embedding column with HNSW index
+
+Revision ID: e5b2c7a4d163
+Revises: a6f1d8e3b920
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2c7a4d163'
+down_revision: Union[str, None] = 'a6f1d8e3b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # halfvec requires pgvector >= 0.7.0
+    op.execute("""
+        ALTER TABLE document_embeddings
+        ADD COLUMN embedding_half halfvec(1536)
+        GENERATED ALWAYS AS (embedding::halfvec(1536)) STORED
+    """)
+
+    # Search now walks the halfvec index and re-ranks with the float32 column,
+    # so the full-precision index is no longer used
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute("SET max_parallel_maintenance_workers = 7")
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doc_emb_half_hnsw
+            ON document_embeddings
+            USING hnsw (embedding_half halfvec_cosine_ops)
+            WITH (m = 24, ef_construction = 128)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_doc_emb_hnsw")
+        op.execute("RESET max_parallel_maintenance_workers")
+        op.execute("RESET maintenance_work_mem")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_doc_emb_hnsw
+            ON document_embeddings
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 24, ef_construction = 128)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_doc_emb_half_hnsw")
+
+    op.drop_column('document_embeddings', 'embedding_half')
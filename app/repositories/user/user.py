@@ -1,6 +1,6 @@
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, lambda_stmt
 
 from app.models.user import User
 
@@ -13,18 +13,17 @@ class UserRepository:
         """Create a new user."""
         self.db.add(user)
         await self.db.commit()
-        await self.db.refresh(user)
         return user
 
     async def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
-        stmt = select(User).where(User.id == user_id)
+        stmt = lambda_stmt(lambda: select(User).where(User.id == user_id))
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
-        stmt = select(User).where(User.email == email)
+        stmt = lambda_stmt(lambda: select(User).where(User.email == email))
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -33,19 +32,56 @@ class UserRepository:
         await self.db.commit()
         return user
 
-    async def get_users_by_account(self, account_id: str) -> List[User]:
-        """Get all users for a specific account."""
-        stmt = select(User).where(User.account_id == account_id)
+    async def get_users_by_account(
+            self,
+            account_id: str,
+            limit: int = 100,
+            after_id: Optional[str] = None
+    ) -> List[User]:
+        """Get a page of users for a specific account, ordered by ID."""
+        stmt = (
+            select(User)
+            .where(User.account_id == account_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
-    async def get_users_by_role(self, account_id: str, role: str) -> List[User]:
-        """Get all users with a specific role in an account."""
+    async def iter_users_by_account(
+            self,
+            account_id: str,
+            partition_size: int = 500
+    ) -> AsyncIterator[List[User]]:
+        """Stream all users for an account in partitions of partition_size."""
+        stmt = (
+            select(User)
+            .where(User.account_id == account_id)
+            .order_by(User.id)
+        )
+        result = await self.db.stream(stmt)
+        async for partition in result.scalars().partitions(partition_size):
+            yield partition
+
+    async def get_users_by_role(
+            self,
+            account_id: str,
+            role: str,
+            limit: int = 100,
+            after_id: Optional[str] = None
+    ) -> List[User]:
+        """Get a page of users with a specific role in an account, ordered by ID."""
         stmt = (
             select(User)
             .where(User.account_id == account_id)
             .where(User.account_role == role)
+            .order_by(User.id)
+            .limit(limit)
         )
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
@@ -108,4 +144,16 @@ class UserRepository:
             result = await self.db.execute(stmt)
             await self.db.commit()
             return result.scalar_one_or_none()
-        return await self.get_user(user_id)
\ No newline at end of file
+        return await self.get_user(user_id)
+
+    async def bulk_update_user_profiles(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Update many users in one batch.
+
+        Each row holds the user's "id" plus the columns to change; rows are sent
+        as a single executemany UPDATE ... WHERE id = ? and committed once.
+        """
+        if not rows:
+            return
+        await self.db.execute(update(User), rows)
+        await self.db.commit()
@@ -0,0 +1,234 @@
+import hashlib
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+
+class SearchResultCache:
+    """
+    TTL cache of similarity search results.
+
+    Keys combine the workspace, a hash of the float16-quantized query vector and
+    the search parameters, plus a per-workspace generation counter. Bumping the
+    generation (when a workspace's searchable documents change) orphans every
+    cached entry for that workspace without scanning the cache; the orphans age
+    out through the TTL/LRU bound. Only invalidated workspaces get a
+    generation entry; searches read it without creating one.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: int = 300):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = {}
+
+    def make_key(
+            self,
+            workspace_id: str,
+            query_embedding: np.ndarray,
+            limit: int,
+            threshold: float
+    ) -> str:
+        """Build the cache key for a search."""
+        digest = hashlib.blake2b(
+            np.asarray(query_embedding, dtype=np.float16).tobytes() + workspace_id.encode(),
+            digest_size=16
+        ).hexdigest()
+        return f"{workspace_id}:{self._generations.get(workspace_id, 0)}:{limit}:{threshold}:{digest}"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached results, or None on a miss."""
+        results = self._cache.get(key)
+        return list(results) if results is not None else None
+
+    def set(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store results for a search."""
+        self._cache[key] = list(results)
+
+    def invalidate_workspace(self, workspace_id: str) -> None:
+        """Drop all cached results for a workspace."""
+        self._generations[workspace_id] = self._generations.get(workspace_id, 0) + 1
+
+
+class SemanticSearchCache:
+    """
+    Near-duplicate search cache.
+
+    Keeps the last `max_entries` (unit query vector -> results) pairs per
+    (workspace, limit, threshold) and serves a lookup when a stored query has
+    cosine similarity >= `similarity_threshold` with the new one. The stored
+    vectors are stacked into one matrix so a lookup is a single matrix-vector
+    product; the matrix is rebuilt only after the entries change.
+
+    At most `max_buckets` buckets are held. A bucket expires `ttl` seconds
+    after it was created, which bounds how stale results can be in processes
+    that did not see the write invalidating them.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 256,
+            similarity_threshold: float = 0.97,
+            max_buckets: int = 32,
+            ttl: int = 300
+    ):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        # (workspace, limit, threshold) -> [entries, (matrix, entry_ids) or None]
+        self._buckets = TTLCache(maxsize=max_buckets, ttl=ttl)
+        self._ids = count()
+
+    def get(
+            self,
+            workspace_id: str,
+            query_embedding: np.ndarray,
+            limit: int,
+            threshold: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get the results of a sufficiently similar earlier search, or None."""
+        bucket = self._buckets.get((workspace_id, limit, threshold))
+        if bucket is None:
+            return None
+
+        entries = bucket[0]
+        if bucket[1] is None:
+            entry_ids = list(entries.keys())
+            bucket[1] = (np.stack([entries[entry_id][0] for entry_id in entry_ids]), entry_ids)
+        matrix, entry_ids = bucket[1]
+
+        scores = matrix @ query_embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        entry_id = entry_ids[best]
+        entries.move_to_end(entry_id)
+        return [dict(result) for result in entries[entry_id][1]]
+
+    def set(
+            self,
+            workspace_id: str,
+            query_embedding: np.ndarray,
+            limit: int,
+            threshold: float,
+            results: List[Dict[str, Any]]
+    ) -> None:
+        """Remember the results of a search."""
+        bucket_key = (workspace_id, limit, threshold)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = [OrderedDict(), None]
+            self._buckets[bucket_key] = bucket
+
+        entries = bucket[0]
+        entries[next(self._ids)] = (query_embedding, [dict(result) for result in results])
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        bucket[1] = None
+
+    def invalidate_workspace(self, workspace_id: str) -> None:
+        """Drop all cached results for a workspace."""
+        for bucket_key in [key for key in self._buckets if key[0] == workspace_id]:
+            self._buckets.pop(bucket_key, None)
+
+
+class WorkspaceEmbeddingCache:
+    """
+    In-memory copy of the searchable embeddings of hot workspaces.
+
+    A workspace becomes hot after `min_searches` searches that missed the
+    cache; the count restarts once it is loaded, so a workspace evicted from
+    the cache has to become hot again before it is reloaded. Its entry is a
+    contiguous float32 matrix of L2-normalized embeddings with the matching
+    chunk IDs, so cosine similarity against every chunk is a single BLAS
+    matrix-vector product. Only workspaces with at most `max_rows` embeddings
+    are held; larger ones are remembered as oversized and stay on the
+    database path.
+
+    Entries, search counts and oversized marks all expire after `ttl`
+    seconds, which bounds both memory and how long a process that did not see
+    an invalidation keeps searching stale embeddings.
+    """
+
+    def __init__(
+            self,
+            max_workspaces: int = 4,
+            max_rows: int = 10000,
+            min_searches: int = 3,
+            ttl: int = 300,
+            max_tracked: int = 4096
+    ):
+        self.max_rows = max_rows
+        self.min_searches = min_searches
+        self._entries = TTLCache(maxsize=max_workspaces, ttl=ttl)
+        self._searches = TTLCache(maxsize=max_tracked, ttl=ttl)
+        self._oversized = TTLCache(maxsize=max_tracked, ttl=ttl)
+        # Workspace -> stamp of its last invalidation, from the same counter as
+        # generation(); kept long enough to outlive any load started before it
+        self._invalidated = TTLCache(maxsize=max_tracked, ttl=ttl)
+        self._clock = count(1)
+
+    def generation(self) -> int:
+        """Stamp for a load starting now; pass it back to set()."""
+        return next(self._clock)
+
+    def get(self, workspace_id: str) -> Optional[Tuple[np.ndarray, List[str]]]:
+        """Get (matrix, chunk_ids) for a workspace, or None if not loaded."""
+        return self._entries.get(workspace_id)
+
+    def should_load(self, workspace_id: str) -> bool:
+        """Record a search that missed the matrix; True once the workspace is hot."""
+        if workspace_id in self._oversized:
+            return False
+        searches = self._searches.get(workspace_id, 0) + 1
+        self._searches[workspace_id] = searches
+        return searches >= self.min_searches
+
+    def set(
+            self,
+            workspace_id: str,
+            generation: int,
+            chunk_ids: List[str],
+            embeddings: List[np.ndarray]
+    ) -> Optional[Tuple[np.ndarray, List[str]]]:
+        """
+        Store a workspace's embeddings loaded at `generation`.
+
+        Loads that raced with an invalidation are discarded.
+        """
+        if self._invalidated.get(workspace_id, 0) > generation or not chunk_ids:
+            return None
+
+        self._searches.pop(workspace_id, None)
+        if len(chunk_ids) > self.max_rows:
+            self._oversized[workspace_id] = True
+            return None
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        matrix /= norms
+        entry = (matrix, chunk_ids)
+        self._entries[workspace_id] = entry
+        return entry
+
+    def invalidate_workspace(self, workspace_id: str) -> None:
+        """Drop a workspace's embeddings."""
+        self._invalidated[workspace_id] = next(self._clock)
+        self._entries.pop(workspace_id, None)
+        self._searches.pop(workspace_id, None)
+        self._oversized.pop(workspace_id, None)
+
+
+# Shared across requests; repositories are created per request
+search_result_cache = SearchResultCache()
+semantic_search_cache = SemanticSearchCache()
+workspace_embedding_cache = WorkspaceEmbeddingCache()
+
+
+def invalidate_workspace_searches(workspace_id: str) -> None:
+    """Invalidate every cached search for a workspace."""
+    search_result_cache.invalidate_workspace(workspace_id)
+    semantic_search_cache.invalidate_workspace(workspace_id)
+    workspace_embedding_cache.invalidate_workspace(workspace_id)
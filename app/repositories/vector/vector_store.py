@@ -1,10 +1,19 @@
-from typing import List, Optional, Dict, Any, Tuple
+import json
+from contextlib import asynccontextmanager
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator
 from datetime import datetime, timezone
 
-from sqlalchemy import select, func, text, update
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import select, func, text, update, insert, bindparam, cast, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import or_
 
+from app.core.id_generator.id_generator import (
+    generate_document_chunk_id,
+    generate_document_embedding_id
+)
 from app.models.vector import (
     DocumentStore,
     DocumentChunk,
@@ -12,18 +21,103 @@ from app.models.vector import (
     EmbeddingSearch,
     DocumentStatus, DocumentStatus
 )
+from app.repositories.vector.search_cache import (
+    search_result_cache,
+    semantic_search_cache,
+    workspace_embedding_cache,
+    invalidate_workspace_searches
+)
+
+# HNSW candidate list size used by similarity search (higher = better recall, slower)
+HNSW_EF_SEARCH = 100
+
+# Candidates fetched from the binary-quantized index before exact re-ranking;
+# 1-bit sketches need a wider candidate set than halfvec for the same recall
+RERANK_CANDIDATES = 800
+
+# Upper bound on index tuples an iterative HNSW scan visits while filling the
+# candidate set for a filtered (per-workspace) search
+HNSW_MAX_SCAN_TUPLES = 100000
+
+SIMILARITY_SEARCH_SQL = """
+    WITH candidates AS (
+        SELECT 
+            de.chunk_id,
+            de.embedding
+        FROM 
+            document_embeddings de
+        WHERE 
+            de.workspace_id = $2
+            AND de.document_status = $3
+        ORDER BY 
+            de.embedding_bits <~> binary_quantize($1::vector(1536))
+        LIMIT $4
+    ),
+    nearest AS (
+        SELECT 
+            chunk_id,
+            embedding <=> $1::vector as distance
+        FROM 
+            candidates
+        ORDER BY 
+            distance
+        LIMIT $5
+    )
+    SELECT
+        dc.id as chunk_id,
+        dc.content,
+        dc.chunk_metadata as chunk_metadata,
+        ds.id as document_id,
+        ds.filename,
+        ds.document_type,
+        ds.document_metadata as document_metadata,
+        1 - nearest.distance as similarity
+    FROM 
+        nearest
+    JOIN 
+        document_chunks dc ON nearest.chunk_id = dc.id
+    JOIN 
+        document_store ds ON dc.document_id = ds.id
+    WHERE 
+        1 - nearest.distance > $6
+    ORDER BY 
+        nearest.distance
+"""
 
 
 class VectorRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self._changed_workspaces = set()
+
+    @asynccontextmanager
+    async def transaction(self, synchronous_commit: bool = True) -> AsyncIterator[AsyncSession]:
+        """
+        Commit the writes made inside the block once, or roll them back on error.
+
+        Create and update methods only flush, so callers group them here.
+        With synchronous_commit=False the commit does not wait for the WAL
+        flush; use it only for data that can be regenerated.
+        """
+        if not synchronous_commit:
+            await self.db.execute(text("SET LOCAL synchronous_commit = off"))
+        try:
+            yield self.db
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            self._changed_workspaces.clear()
+            raise
+
+        for workspace_id in self._changed_workspaces:
+            invalidate_workspace_searches(workspace_id)
+        self._changed_workspaces.clear()
 
     # Document store methods
     async def create_document(self, document: DocumentStore) -> DocumentStore:
         """Create a new document entry."""
         self.db.add(document)
-        await self.db.commit()
-        await self.db.refresh(document)
+        await self.db.flush()
         return document
 
     async def get_document(
@@ -56,25 +150,38 @@ class VectorRepository:
             offset: int = 0
     ) -> Tuple[List[DocumentStore], int]:
         """Get documents for a workspace with optional filters."""
-        # Build base query
-        query = select(DocumentStore).where(DocumentStore.workspace_id == workspace_id)
+        # Build filters
+        filters = [DocumentStore.workspace_id == workspace_id]
 
         # Add filters if provided
         if status:
-            query = query.where(DocumentStore.status == status)
+            filters.append(DocumentStore.status == status)
         if document_type:
-            query = query.where(DocumentStore.document_type == document_type)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await self.db.scalar(count_query)
-
-        # Add pagination
-        query = query.order_by(DocumentStore.upload_date.desc()).offset(offset).limit(limit)
+            filters.append(DocumentStore.document_type == document_type)
+
+        # Get the page and the total count in one query
+        query = (
+            select(DocumentStore, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(DocumentStore.upload_date.desc())
+            .offset(offset)
+            .limit(limit)
+        )
 
         # Execute query
         result = await self.db.execute(query)
-        documents = list(result.scalars().all())
+        rows = result.all()
+        documents = [row.DocumentStore for row in rows]
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Page past the end: the window count is unavailable without rows
+            total = await self.db.scalar(
+                select(func.count()).select_from(DocumentStore).where(*filters)
+            )
+        else:
+            total = 0
 
         return documents, total
 
@@ -84,15 +191,21 @@ class VectorRepository:
             error_message: Optional[str] = None
     ) -> Optional[DocumentStore]:
         """Update document processing status."""
-        document = await self.get_document(document_id)
-        if not document:
-            return None
-
-        document.status = status
+        values = {"status": status}
         if error_message:
-            document.error_message = error_message
+            values["error_message"] = error_message
 
-        await self.db.commit()
+        stmt = (
+            update(DocumentStore)
+            .where(DocumentStore.id == document_id)
+            .values(**values)
+            .returning(DocumentStore)
+        )
+        result = await self.db.execute(stmt)
+        document = result.scalar_one_or_none()
+
+        if document:
+            self._changed_workspaces.add(document.workspace_id)
         return document
 
     async def update_document_metadata(
@@ -100,31 +213,61 @@ class VectorRepository:
             document_id: str,
             metadata: Dict[str, Any]
     ) -> Optional[DocumentStore]:
-        """Update document metadata."""
-        document = await self.get_document(document_id)
-        if not document:
-            return None
-
-        if document.document_metadata:
-            document.document_metadata.update(metadata)
-        else:
-            document.document_metadata = metadata
+        """Merge metadata into the document's existing metadata."""
+        stmt = (
+            update(DocumentStore)
+            .where(DocumentStore.id == document_id)
+            .values(
+                document_metadata=func.coalesce(
+                    DocumentStore.document_metadata,
+                    cast({}, JSONB)
+                ).op("||")(cast(metadata, JSONB))
+            )
+            .returning(DocumentStore)
+        )
+        result = await self.db.execute(stmt)
+        document = result.scalar_one_or_none()
 
-        await self.db.commit()
+        if document:
+            self._changed_workspaces.add(document.workspace_id)
         return document
 
     # Chunk methods
     async def create_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
         """Create a new document chunk."""
         self.db.add(chunk)
-        await self.db.commit()
-        await self.db.refresh(chunk)
+        await self.db.flush()
         return chunk
 
     async def create_chunks_batch(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
-        """Create multiple document chunks in a batch."""
-        self.db.add_all(chunks)
-        await self.db.commit()
+        """Create multiple document chunks in a batch using COPY."""
+        if not chunks:
+            return chunks
+
+        created_at = datetime.now(timezone.utc)
+        for chunk in chunks:
+            if chunk.id is None:
+                chunk.id = generate_document_chunk_id()
+            if chunk.chunk_metadata is None:
+                chunk.chunk_metadata = {}
+            chunk.created_at = created_at
+
+        connection = await self._get_driver_connection()
+        await connection.copy_records_to_table(
+            DocumentChunk.__tablename__,
+            columns=["id", "document_id", "chunk_index", "content", "chunk_metadata", "created_at"],
+            records=[
+                (
+                    chunk.id,
+                    chunk.document_id,
+                    chunk.chunk_index,
+                    chunk.content,
+                    json.dumps(chunk.chunk_metadata),
+                    chunk.created_at
+                )
+                for chunk in chunks
+            ]
+        )
         return chunks
 
     async def get_chunks_by_document(self, document_id: str) -> List[DocumentChunk]:
@@ -136,17 +279,44 @@ class VectorRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def iter_chunks_by_document(self, document_id: str) -> AsyncIterator[DocumentChunk]:
+        """Stream all chunks for a document in order without loading them all at once."""
+        result = await self.db.stream_scalars(
+            select(DocumentChunk)
+            .where(DocumentChunk.document_id == document_id)
+            .order_by(DocumentChunk.chunk_index)
+        )
+        async for chunk in result:
+            yield chunk
+
     # Embedding methods
     async def create_embedding(self, embedding: DocumentEmbedding) -> DocumentEmbedding:
         """Create a new embedding."""
         self.db.add(embedding)
-        await self.db.commit()
-        await self.db.refresh(embedding)
+        await self.db.flush()
         return embedding
 
+    async def create_embeddings_batch(self, embeddings: List[DocumentEmbedding]) -> List[DocumentEmbedding]:
+        """Create multiple embeddings with a single executemany INSERT."""
+        if not embeddings:
+            return embeddings
+
+        for embedding in embeddings:
+            if embedding.id is None:
+                embedding.id = generate_document_embedding_id()
+
+        await self.db.execute(
+            insert(DocumentEmbedding),
+            [
+                {"id": embedding.id, "chunk_id": embedding.chunk_id, "embedding": embedding.embedding}
+                for embedding in embeddings
+            ]
+        )
+        return embeddings
+
     async def search_similar_embeddings(
             self,
-            query_embedding: List[float],
+            query_embedding: np.ndarray,
             workspace_id: str,
             limit: int = 10,
             threshold: float = 0.7
@@ -154,14 +324,113 @@ class VectorRepository:
         """
         Search for similar embeddings using cosine similarity.
 
+        `query_embedding` must be a unit-length float32 vector.
+
         Note: This requires the pgvector extension to be installed in PostgreSQL.
+        Results are cached per workspace until its documents change; near-duplicate
+        queries are served from the semantic cache, and hot workspaces are searched
+        in memory instead of in the database.
+        """
+        cache_key = search_result_cache.make_key(workspace_id, query_embedding, limit, threshold)
+        cached = search_result_cache.get(cache_key)
+        if cached is None:
+            cached = semantic_search_cache.get(workspace_id, query_embedding, limit, threshold)
+        if cached is not None:
+            return cached
+
+        results = await self._search_in_memory(query_embedding, workspace_id, limit, threshold)
+        if results is None:
+            results = await self._search_database(query_embedding, workspace_id, limit, threshold)
+
+        search_result_cache.set(cache_key, results)
+        semantic_search_cache.set(workspace_id, query_embedding, limit, threshold, results)
+        return results
+
+    async def _search_database(
+            self,
+            query_embedding: np.ndarray,
+            workspace_id: str,
+            limit: int,
+            threshold: float
+    ) -> List[Dict[str, Any]]:
         """
-        # Convert Python list to PostgreSQL vector literal
-        vector_str = f"'[{','.join(map(str, query_embedding))}]'"
+        Run the similarity search in PostgreSQL.
 
-        # SQL query using pgvector's <=> operator (cosine distance)
-        # Updated with correct column names from schema
-        query = text(f"""
+        Two stages: the HNSW index over the binary-quantized embeddings picks
+        the nearest candidates by Hamming distance, which are then re-ranked by
+        exact float32 cosine distance. Candidates are filtered on the workspace
+        and status columns copied onto document_embeddings, so chunks and
+        documents are joined only for the final top-k.
+        """
+        candidate_limit = max(limit, RERANK_CANDIDATES)
+
+        # Size of the HNSW candidate list for this transaction (recall vs latency);
+        # an HNSW scan returns at most ef_search rows, so it must cover the
+        # candidate set. SET LOCAL cannot take bind parameters, set_config(..., true)
+        # is equivalent
+        await self.db.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(max(HNSW_EF_SEARCH, candidate_limit))}
+        )
+
+        # The index covers every workspace and the workspace/status filter is
+        # applied to what the scan returns, so a small workspace would only see
+        # its share of ef_search rows; iterative scans (pgvector >= 0.8) keep
+        # walking the graph until the candidate set is filled. Candidates are
+        # re-ranked exactly afterwards, so relaxed ordering is enough
+        await self.db.execute(
+            text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+        )
+        await self.db.execute(
+            text("SELECT set_config('hnsw.max_scan_tuples', :max_scan_tuples, true)"),
+            {"max_scan_tuples": str(HNSW_MAX_SCAN_TUPLES)}
+        )
+
+        # Run on the driver connection: asyncpg keeps the statement prepared per
+        # connection and sends the query vector through the binary codec
+        connection = await self._get_driver_connection()
+        rows = await connection.fetch(
+            SIMILARITY_SEARCH_SQL,
+            query_embedding,
+            workspace_id,
+            DocumentStatus.COMPLETED.value,
+            candidate_limit,
+            limit,
+            threshold
+        )
+
+        return [dict(row) for row in rows]
+
+    async def _search_in_memory(
+            self,
+            query_embedding: np.ndarray,
+            workspace_id: str,
+            limit: int,
+            threshold: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run the similarity search against the workspace's in-memory embedding matrix.
+
+        Returns None when the workspace is not (or cannot be) held in memory.
+        """
+        entry = workspace_embedding_cache.get(workspace_id)
+        if entry is None:
+            if not workspace_embedding_cache.should_load(workspace_id):
+                return None
+            entry = await self._load_workspace_embeddings(workspace_id)
+            if entry is None:
+                return None
+
+        matrix, chunk_ids = entry
+        scores = matrix @ query_embedding
+        k = min(limit, len(chunk_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        matches = [(chunk_ids[i], float(scores[i])) for i in top if scores[i] > threshold]
+        if not matches:
+            return []
+
+        query = text("""
             SELECT 
                 dc.id as chunk_id,
                 dc.content,
@@ -169,60 +438,80 @@ class VectorRepository:
                 ds.id as document_id,
                 ds.filename,
                 ds.document_type,
-                ds.document_metadata as document_metadata,
-                1 - (de.embedding <=> {vector_str}::vector) as similarity
+                ds.document_metadata as document_metadata
             FROM 
-                document_embeddings de
-            JOIN 
-                document_chunks dc ON de.chunk_id = dc.id
+                document_chunks dc
             JOIN 
                 document_store ds ON dc.document_id = ds.id
             WHERE 
-                ds.workspace_id = :workspace_id
+                dc.id IN :chunk_ids
+                AND ds.workspace_id = :workspace_id
                 AND ds.status = :completed_status
-                AND 1 - (de.embedding <=> {vector_str}::vector) > :threshold
-            ORDER BY 
-                similarity DESC
-            LIMIT :limit
-        """)
+        """).bindparams(bindparam("chunk_ids", expanding=True))
 
-        # Execute the query
+        # The matrix may predate a delete seen by another process; only return
+        # chunks that are still searchable
         result = await self.db.execute(
             query,
             {
+                "chunk_ids": [chunk_id for chunk_id, _ in matches],
                 "workspace_id": workspace_id,
-                "completed_status": DocumentStatus.COMPLETED.value,
-                "threshold": threshold,
-                "limit": limit
+                "completed_status": DocumentStatus.COMPLETED.value
             }
         )
+        rows = {row["chunk_id"]: row for row in result.mappings()}
 
-        # Process results
-        rows = result.fetchall()
-        results = []
-
-        for row in rows:
-            # Convert row to dict
-            result_dict = {
-                "chunk_id": row.chunk_id,
-                "content": row.content,
-                "chunk_metadata": row.chunk_metadata,
-                "document_id": row.document_id,
-                "filename": row.filename,
-                "document_type": row.document_type,
-                "document_metadata": row.document_metadata,
-                "similarity": row.similarity
-            }
-            results.append(result_dict)
+        results = [
+            {**rows[chunk_id], "similarity": similarity}
+            for chunk_id, similarity in matches
+            if chunk_id in rows
+        ]
 
         return results
 
+    async def _load_workspace_embeddings(
+            self,
+            workspace_id: str
+    ) -> Optional[Tuple[np.ndarray, List[str]]]:
+        """Load a workspace's searchable embeddings into the in-memory cache."""
+        generation = workspace_embedding_cache.generation()
+
+        query = text("""
+            SELECT 
+                de.chunk_id,
+                de.embedding
+            FROM 
+                document_embeddings de
+            WHERE 
+                de.workspace_id = :workspace_id
+                AND de.document_status = :completed_status
+                AND de.embedding IS NOT NULL
+            LIMIT :max_rows
+        """).columns(chunk_id=String, embedding=Vector(1536))
+
+        result = await self.db.execute(
+            query,
+            {
+                "workspace_id": workspace_id,
+                "completed_status": DocumentStatus.COMPLETED.value,
+                # One extra row tells us the workspace is over the cap
+                "max_rows": workspace_embedding_cache.max_rows + 1
+            }
+        )
+        rows = result.all()
+
+        return workspace_embedding_cache.set(
+            workspace_id,
+            generation,
+            [row.chunk_id for row in rows],
+            [row.embedding for row in rows]
+        )
+
     # Search history methods
     async def create_search(self, search: EmbeddingSearch) -> EmbeddingSearch:
         """Create a new search entry."""
         self.db.add(search)
-        await self.db.commit()
-        await self.db.refresh(search)
+        await self.db.flush()
         return search
 
     async def get_searches_by_workspace(
@@ -240,6 +529,12 @@ class VectorRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def _get_driver_connection(self):
+        """Get the asyncpg connection behind the session's current transaction."""
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
     async def delete_document_soft(
             self,
             document_id: str
@@ -252,26 +547,27 @@ class VectorRepository:
                 status=DocumentStatus.DELETED.value,
                 deleted_at=datetime.now(timezone.utc)
             )
-            .returning(DocumentStore)
+            .returning(DocumentStore.workspace_id)
         )
 
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        workspace_id = result.scalar_one_or_none()
         await self.db.commit()
 
+        if workspace_id:
+            invalidate_workspace_searches(workspace_id)
         return None
 
     async def delete_document_permanent(self, document_id: str) -> None:
         """Permanently delete a document and all its related data."""
-        # First get all chunks
-        chunks = await self.get_chunks_by_document(document_id)
-
-        # Delete embeddings for each chunk
-        for chunk in chunks:
-            # Use raw SQL for efficiency with many chunks
-            await self.db.execute(
-                text("DELETE FROM document_embeddings WHERE chunk_id = :chunk_id"),
-                {"chunk_id": chunk.id}
-            )
+        # Delete embeddings for all chunks in one statement
+        await self.db.execute(
+            text("""
+                DELETE FROM document_embeddings
+                WHERE chunk_id IN (SELECT id FROM document_chunks WHERE document_id = :document_id)
+            """),
+            {"document_id": document_id}
+        )
 
         # Delete all chunks
         await self.db.execute(
@@ -280,10 +576,14 @@ class VectorRepository:
         )
 
         # Finally delete the document itself
-        await self.db.execute(
-            text("DELETE FROM document_store WHERE id = :document_id"),
+        result = await self.db.execute(
+            text("DELETE FROM document_store WHERE id = :document_id RETURNING workspace_id"),
             {"document_id": document_id}
         )
+        workspace_id = result.scalar_one_or_none()
 
         await self.db.commit()
+
+        if workspace_id:
+            invalidate_workspace_searches(workspace_id)
         return None
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import AsyncIterator, Optional
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.workspace import Workspace
@@ -53,6 +53,17 @@ class WorkspaceRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def iter_workspaces_by_account(self, account_id: str) -> AsyncIterator[Workspace]:
+        """Stream all workspaces for a specific account."""
+        result = await self.db.stream_scalars(
+            select(Workspace).where(
+                Workspace.account_id == account_id,
+                Workspace.deleted_at.is_(None)
+            )
+        )
+        async for workspace in result:
+            yield workspace
+
     async def get_workspaces(
             self,
             skip: int = 0,
@@ -63,20 +74,32 @@ class WorkspaceRepository:
         Get paginated list of workspaces with optional account filtering.
         Returns tuple of (workspaces, total_count)
         """
-        # Base query for non-deleted workspaces
-        query = select(Workspace).where(Workspace.deleted_at.is_(None))
+        # Base query for non-deleted workspaces, with the total match count as a window column
+        filters = [Workspace.deleted_at.is_(None)]
 
         # Add account filter if provided
         if account_id:
-            query = query.where(Workspace.account_id == account_id)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await self.db.scalar(count_query)
+            filters.append(Workspace.account_id == account_id)
 
-        # Get paginated results
-        query = query.offset(skip).limit(limit)
+        # Get paginated results and total count in one query
+        query = (
+            select(Workspace, func.count().over().label("total"))
+            .where(*filters)
+            .offset(skip)
+            .limit(limit)
+        )
         result = await self.db.execute(query)
-        workspaces = list(result.scalars().all())
+        rows = result.all()
+        workspaces = [row.Workspace for row in rows]
+
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Page past the end: the window count is unavailable without rows
+            total = await self.db.scalar(
+                select(func.count()).select_from(Workspace).where(*filters)
+            )
+        else:
+            total = 0
 
         return workspaces, total
\ No newline at end of file
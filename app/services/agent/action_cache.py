@@ -0,0 +1,51 @@
+# app/services/agent/action_cache.py
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import orjson
+from cachetools import TTLCache
+
+
+class ActionCache:
+    """
+    Cache of ReAct tool actions chosen by the LLM.
+
+    The LLM prompt is built from the query, the tool list and the action
+    history, so an action is keyed by workspace plus a digest of all three.
+    The query only has its case and whitespace normalized: questions that
+    differ in a quarter, stage or number must not share a tool input, so a
+    merely similar query is a miss. Entries expire after `ttl` seconds so
+    cached decisions follow changes in the underlying data.
+
+    Only tool calls are cached. A final answer is never stored.
+    """
+
+    def __init__(self, max_entries: int = 16384, ttl: int = 600):
+        self._actions: TTLCache = TTLCache(maxsize=max_entries, ttl=ttl)
+
+    @staticmethod
+    def make_key(
+            workspace_id: str,
+            query: str,
+            tools: List[Dict[str, str]],
+            actions: List[Dict[str, Any]]
+    ) -> str:
+        """Build the cache key for a step of the ReAct loop."""
+        context = orjson.dumps(
+            [" ".join(query.lower().split()), tools, actions],
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+        digest = hashlib.blake2b(context, digest_size=16).hexdigest()
+        return f"{workspace_id}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the action cached for this step, or None."""
+        action = self._actions.get(key)
+        return dict(action) if action is not None else None
+
+    def set(self, key: str, action: Dict[str, Any]) -> None:
+        """Remember the action chosen for this step; final answers are not cached."""
+        if action["action_type"] == "final_answer":
+            return
+        self._actions[key] = dict(action)
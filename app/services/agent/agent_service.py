@@ -1,10 +1,14 @@
 # app/services/agent/agent_service.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
 import json
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.routes.v1.agents.response import AgentResponse
+from app.core.background import run_in_background
+from app.core.database import async_session
 from app.models.agent import Conversation, AgentState
+from app.services.agent.action_cache import ActionCache
 from app.services.agent.tools.tool_registry import ToolRegistry
 from app.repositories.agent.agent_repository import AgentRepository
 from app.services.llm.llm import LLMService
@@ -16,12 +20,14 @@ class AgentService:
             db: AsyncSession,
             repository: AgentRepository,
             tool_registry: ToolRegistry,
-            llm_service: LLMService
+            llm_service: LLMService,
+            action_cache: ActionCache
     ):
         self.db = db
         self.repository = repository
         self.tool_registry = tool_registry
         self.llm_service = llm_service
+        self.action_cache = action_cache
 
     async def process_query(
             self,
@@ -31,90 +37,176 @@ class AgentService:
             conversation_id: Optional[str] = None
     ) -> AgentResponse:
         """Process a user query using ReAct pattern"""
+        conversation, agent_state = await self._start_query(
+            workspace_id, user_id, query, conversation_id
+        )
+
+        # Execute ReAct loop
+        max_steps = 5  # Prevent infinite loops
+        for step in range(max_steps):
+            # Get the next tool call from the cache, or ask the LLM on a miss
+            cache_key = self.action_cache.make_key(workspace_id, query, agent_state.tools, agent_state.actions)
+            action = self.action_cache.get(cache_key)
+            if action is None:
+                action = await self.llm_service.get_next_action(agent_state)
+                self.action_cache.set(cache_key, action)
+
+            if await self._apply_action(agent_state, action):
+                break
+
+        self._finish_query(conversation, agent_state)
+
+        return AgentResponse(
+            conversation_id=str(conversation.id),
+            answer=agent_state.final_answer,
+            reasoning=agent_state.thoughts,
+            actions=agent_state.actions,
+        )
+
+    async def process_query_stream(
+            self,
+            workspace_id: str,
+            user_id: str,
+            query: str,
+            conversation_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a user query like process_query, streaming the final answer
+
+        Yields {"conversation_id": ...} first, then {"answer_delta": text}
+        chunks of the final answer as the LLM generates them.
+        """
+        conversation, agent_state = await self._start_query(
+            workspace_id, user_id, query, conversation_id
+        )
+        try:
+            yield {"conversation_id": str(conversation.id)}
+
+            max_steps = 5  # Prevent infinite loops
+            for step in range(max_steps):
+                cache_key = self.action_cache.make_key(workspace_id, query, agent_state.tools, agent_state.actions)
+                action = self.action_cache.get(cache_key)
+                if action is None:
+                    async for event in self.llm_service.stream_next_action(agent_state):
+                        if "action" in event:
+                            action = event["action"]
+                        else:
+                            yield event
+                    self.action_cache.set(cache_key, action)
+
+                if await self._apply_action(agent_state, action):
+                    break
+        finally:
+            # Also runs when the client disconnects mid-stream
+            self._finish_query(conversation, agent_state)
+
+    async def _start_query(
+            self,
+            workspace_id: str,
+            user_id: str,
+            query: str,
+            conversation_id: Optional[str]
+    ) -> Tuple[Conversation, AgentState]:
+        """Set up the conversation, user message and agent state for a query"""
 
-        # Get or create conversation
+        # Get or create the conversation and store the user message in one transaction
         conversation = await self._get_or_create_conversation(workspace_id, user_id, conversation_id)
+        await self.repository.add_messages(conversation.id, [{"role": "user", "content": query}])
+        await self.db.commit()
 
-        # Add user message
-        message = await self.repository.add_message(conversation.id, "user", query)
+        # Initialize agent state with the available tools
+        agent_state = AgentState(
+            query=query,
+            workspace_id=workspace_id,
+            user_id=user_id,
+            conversation_id=conversation.id,
+            tools=self.tool_registry.tools_with_descriptions,
+            tools_text=self.tool_registry.tools_text,
+            thoughts=[],
+            actions=[],
+            final_answer=None
+        )
 
-        # Get available tools with descriptions
-        tools = self.tool_registry.get_tools_with_descriptions()
+        return conversation, agent_state
 
-        # Initialize agent state
-        agent_state = {
-            "query": query,
-            "workspace_id": workspace_id,
-            "user_id": user_id,
-            "conversation_id": conversation.id,
-            "tools": tools,
-            "thoughts": [],
-            "actions": [],
-            "final_answer": None
-        }
+    async def _apply_action(self, agent_state: AgentState, action: Dict[str, Any]) -> bool:
+        """Record an action in the agent state and run its tool; True once the answer is final"""
 
-        # Execute ReAct loop
-        max_steps = 5  # Prevent infinite loops
-        for step in range(max_steps):
-            # Get next action from LLM
-            action = await self.llm_service.get_next_action(agent_state)
+        # Store the thought process
+        agent_state.thoughts.append(action["thought"])
 
-            # Store the thought process
-            agent_state["thoughts"].append(action["thought"])
+        # If final answer, stop the loop
+        if action["action_type"] == "final_answer":
+            agent_state.final_answer = action["action_input"]
+            return True
 
-            # If final answer, break the loop
-            if action["action_type"] == "final_answer":
-                agent_state["final_answer"] = action["action_input"]
-                break
+        # Execute tool and get result
+        if action["action_type"] == "tool":
+            tool_name = action["tool_name"]
+            tool_input = action["action_input"]
 
-            # Execute tool and get result
-            if action["action_type"] == "tool":
-                tool_name = action["tool_name"]
-                tool_input = action["action_input"]
-
-                # Store the action
-                agent_state["actions"].append({
-                    "tool": tool_name,
-                    "input": tool_input
-                })
-
-                # Execute the tool
-                tool = self.tool_registry.get_tool_by_name(tool_name)
-                if not tool:
-                    tool_result = {"error": f"Tool {tool_name} not found"}
-                else:
-                    tool_result = await tool.execute(
-                        workspace_id=workspace_id,
-                        user_id=user_id,
-                        query=tool_input,
-                        conversation_id=conversation.id
-                    )
-
-                # Add result to agent state
-                agent_state["actions"][-1]["result"] = tool_result
-
-        # Store the final answer
-        message = await self.repository.add_message(
-            conversation.id,
-            "agent",
-            agent_state["final_answer"]
-        )
-        # agent_state["actions"].append(message)
+            # Store the action
+            agent_state.actions.append({
+                "tool": tool_name,
+                "input": tool_input
+            })
 
-        return AgentResponse(
-            conversation_id=str(conversation.id),
-            answer=agent_state["final_answer"],
-            reasoning=agent_state["thoughts"],
-            actions=agent_state["actions"],
+            # Execute the tool
+            tool = self.tool_registry.get_tool_by_name(tool_name)
+            if not tool:
+                tool_result = {"error": f"Tool {tool_name} not found"}
+            else:
+                tool_result = await tool.execute(
+                    workspace_id=agent_state.workspace_id,
+                    user_id=agent_state.user_id,
+                    query=tool_input,
+                    conversation_id=agent_state.conversation_id
+                )
+
+            # Add result to agent state
+            agent_state.actions[-1]["result"] = tool_result
+
+        return False
+
+    def _finish_query(
+            self,
+            conversation: Conversation,
+            agent_state: AgentState
+    ) -> None:
+        """Store the agent's answer after the response is sent; nothing is stored without one"""
+        if agent_state.final_answer is None:
+            return
+
+        run_in_background(
+            self._save_messages(
+                conversation.id,
+                [{"role": "agent", "content": agent_state.final_answer}]
+            ),
+            f"store answer for conversation {conversation.id}"
         )
 
+    @staticmethod
+    async def _save_messages(
+            conversation_id: str,
+            messages: List[Dict[str, Any]]
+    ) -> None:
+        """Store messages with a session of their own; the request's session is closed by then"""
+        async with async_session() as session, session.begin():
+            await AgentRepository(session).add_messages(conversation_id, messages)
+
     async def _get_or_create_conversation(
             self,
             workspace_id: str,
             user_id: str,
             conversation_id: Optional[str] = None
     )-> Conversation:
-        """Get existing conversation or create a new one"""
+        """
+        Get existing conversation or create a new one
+
+        A new conversation is only flushed; the caller commits it together
+        with the user message before the query runs, so its ID is valid for
+        follow-up requests as soon as it reaches the client.
+        """
         if conversation_id:
             conversation = await self.repository.get_conversation(conversation_id)
             if conversation and conversation.workspace_id == workspace_id:
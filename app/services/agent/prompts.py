@@ -1,10 +1,12 @@
 from typing import Dict, Any
 from enum import Enum
+from textwrap import dedent
 
 
 class PromptTemplate(Enum):
     """Enum for different types of prompts"""
     SYSTEM = "system"
+    ACCOUNT_CONTEXT = "account_context"
     RECOMMENDATIONS = "recommendations"
     RISK_ANALYSIS = "risk_analysis"
     OPPORTUNITY_ANALYSIS = "opportunity_analysis"
@@ -12,9 +14,17 @@ class PromptTemplate(Enum):
 
 
 class CRMPrompts:
-    """Collection of prompts for CRM analysis"""
+    """
+    Collection of prompts for CRM analysis
+
+    Each prompt keeps its fixed instructions first and the account data last,
+    and SYSTEM_PROMPT has no placeholders at all, so requests for different
+    accounts share an identical prefix that provider prompt caching can reuse.
+    Send SYSTEM_PROMPT and then ACCOUNT_CONTEXT_PROMPT as separate messages.
+    Templates are dedented once at import so no indentation is sent as tokens.
+    """
 
-    SYSTEM_PROMPT = """
+    SYSTEM_PROMPT = dedent("""
     You are an expert CRM analyst and business consultant. Your task is to analyze CRM data 
     and provide actionable recommendations. Focus on:
     1. Identifying risk patterns
@@ -23,28 +33,21 @@ class CRMPrompts:
     4. Providing context-aware solutions
     
     Format your recommendations with clear steps, priorities, and expected outcomes.
-    
+    """)
+
+    ACCOUNT_CONTEXT_PROMPT = dedent("""
     Account Context:
     - Industry: {industry}
     - Company Size: {company_size}
     - Current Health Score: {health_score}
-    """
-
-    RECOMMENDATIONS_PROMPT = """
-    Based on the following CRM analysis data:
-    {context}
+    """)
 
+    RECOMMENDATIONS_PROMPT = dedent("""
     Provide specific, actionable recommendations to:
     1. Address identified risks
     2. Capitalize on opportunities
     3. Improve overall account health
 
-    Consider these specific aspects:
-    - Current Engagement Level: {engagement_level}
-    - Deal Pipeline Status: {pipeline_status}
-    - Recent Activity Trends: {activity_trends}
-    - Key Stakeholder Involvement: {stakeholder_status}
-
     Format your response as a JSON array of recommendations, where each recommendation has:
     - priority (high/medium/low)
     - category (engagement/pipeline/relationship/process)
@@ -53,17 +56,19 @@ class CRMPrompts:
     - timeline (in days)
     - implementation_complexity (high/medium/low)
     - required_resources (array of strings)
-    """
 
-    RISK_ANALYSIS_PROMPT = """
-    Analyze the following risk indicators for the account:
-    {risk_data}
+    Consider these specific aspects:
+    - Current Engagement Level: {engagement_level}
+    - Deal Pipeline Status: {pipeline_status}
+    - Recent Activity Trends: {activity_trends}
+    - Key Stakeholder Involvement: {stakeholder_status}
 
-    Key Metrics:
-    - Days Since Last Contact: {days_since_contact}
-    - Deal Stagnation: {deal_stagnation}
-    - Engagement Decline Rate: {engagement_decline}
-    - Response Time Trends: {response_trends}
+    CRM analysis data:
+    {context}
+    """)
+
+    RISK_ANALYSIS_PROMPT = dedent("""
+    Analyze the risk indicators for the account given below.
 
     Provide a detailed risk assessment focusing on:
     1. Immediate threats to account health
@@ -76,19 +81,19 @@ class CRMPrompts:
     - key_risks (array of risk factors)
     - mitigation_strategies (array of actionable steps)
     - monitoring_recommendations (array of metrics to track)
-    """
-
-    OPPORTUNITY_ANALYSIS_PROMPT = """
-    Based on the following account data:
-    {account_data}
 
-    Current Product Usage:
-    {product_usage}
+    Key Metrics:
+    - Days Since Last Contact: {days_since_contact}
+    - Deal Stagnation: {deal_stagnation}
+    - Engagement Decline Rate: {engagement_decline}
+    - Response Time Trends: {response_trends}
 
-    Similar Account Patterns:
-    {similar_accounts}
+    Risk indicators:
+    {risk_data}
+    """)
 
-    Identify growth opportunities considering:
+    OPPORTUNITY_ANALYSIS_PROMPT = dedent("""
+    Identify growth opportunities for the account given below, considering:
     1. Product expansion possibilities
     2. Usage pattern optimization
     3. Engagement improvement areas
@@ -99,18 +104,19 @@ class CRMPrompts:
     - priority_ranking (array of prioritized actions)
     - expected_impact (object with impact metrics)
     - implementation_plan (array of steps)
-    """
 
-    ENGAGEMENT_ANALYSIS_PROMPT = """
-    Review the following engagement patterns:
-    {engagement_data}
+    Account data:
+    {account_data}
 
-    Communication History:
-    - Meeting Frequency: {meeting_frequency}
-    - Email Response Rates: {email_metrics}
-    - Key Contact Involvement: {contact_involvement}
+    Current Product Usage:
+    {product_usage}
+
+    Similar Account Patterns:
+    {similar_accounts}
+    """)
 
-    Analyze the engagement health focusing on:
+    ENGAGEMENT_ANALYSIS_PROMPT = dedent("""
+    Review the engagement patterns given below and analyze the engagement health focusing on:
     1. Communication effectiveness
     2. Stakeholder participation
     3. Engagement quality
@@ -121,4 +127,12 @@ class CRMPrompts:
     - strength_factors (array of strong points)
     - weakness_factors (array of areas to improve)
     - engagement_recommendations (array of specific actions)
-    """
\ No newline at end of file
+
+    Communication History:
+    - Meeting Frequency: {meeting_frequency}
+    - Email Response Rates: {email_metrics}
+    - Key Contact Involvement: {contact_involvement}
+
+    Engagement patterns:
+    {engagement_data}
+    """)
@@ -1,8 +1,34 @@
 # app/services/agent/tools/deal_analysis_tool.py
-from typing import Dict, Any, List
+from typing import Dict, Any, Mapping, Sequence
 from app.services.agent.tools.tool_registry import BaseTool
+from app.services.agent.tools.deal_kernels import DealFrame, group_totals, stage_groups, weighted_revenue
 from app.repositories.hubspot.deal_repository import DealRepository
+from app.repositories.hubspot.deal_cache import deal_analysis_cache
 import json
+from functools import lru_cache
+
+import numpy as np
+
+# Checked in order; the first analysis type with a matching keyword wins
+ANALYSIS_KEYWORDS = (
+    ("pipeline_health", ("pipeline", "funnel", "stages")),
+    ("conversion_rates", ("conversion", "win rate", "close rate")),
+    ("revenue_forecast", ("forecast", "predict", "revenue")),
+    ("stalled_deals", ("stuck", "stalled", "bottleneck")),
+)
+
+# Deals in their stage for more than this many days are considered stalled
+STALLED_DEAL_DAYS = 30
+
+
+@lru_cache(maxsize=2048)
+def _analysis_type_for(query: str) -> str:
+    """Map a lowercased query to an analysis type; repeated queries hit the cache"""
+    for analysis_type, keywords in ANALYSIS_KEYWORDS:
+        if any(word in query for word in keywords):
+            return analysis_type
+
+    return "summary"
 
 
 class DealAnalysisTool(BaseTool):
@@ -27,221 +53,170 @@ class DealAnalysisTool(BaseTool):
     ) -> Dict[str, Any]:
         """Execute deal analysis based on the query"""
 
-        # Parse the analysis type and parameters from the query
-        try:
-            # Try to parse JSON if provided
-            params = json.loads(query)
+        # Parse the analysis type and parameters from the query; only a JSON
+        # object can carry them, so plain-text queries skip the parse
+        params = None
+        if query.lstrip().startswith("{"):
+            try:
+                params = json.loads(query)
+            except json.JSONDecodeError:
+                pass
+
+        if params is not None:
             analysis_type = params.get("analysis_type", "summary")
-        except:
+        else:
             # Otherwise extract from text
             analysis_type = self._determine_analysis_type(query)
 
-        # Get deals for the workspace
-        deals = await self.deal_repository.get_deals_by_workspace(workspace_id)
-
-        # Convert SQLAlchemy objects to dictionaries
-        deal_dicts = []
-        for deal in deals:
-            deal_dict = {
-                "id": deal.id,
-                "external_id": deal.external_id,
-                "name": deal.name,
-                "amount": deal.amount,
-                "pipeline_id": deal.pipeline_id,
-                "stage_id": deal.stage_id,
-                "stage_name": deal.stage_name,
-                "owner_id": deal.owner_id,
-                "created_date": deal.created_date.isoformat() if deal.created_date else None,
-                "close_date": deal.close_date.isoformat() if deal.close_date else None,
-                "probability": deal.probability,
-                "days_in_stage": deal.days_in_stage,
-                "days_in_pipeline": deal.days_in_pipeline
+        frame = deal_analysis_cache.get(workspace_id)
+        if frame is None and analysis_type == "stalled_deals":
+            # Only the stalled deals are needed, so let the database filter
+            # and sort them instead of loading the whole workspace
+            stalled_deals = await self.deal_repository.get_stalled_deals(workspace_id, STALLED_DEAL_DAYS)
+            return {
+                "analysis_type": analysis_type,
+                "deal_count": await self.deal_repository.count_deals(workspace_id),
+                "data": self._stalled_deals_data(stalled_deals)["data"]
             }
-            deal_dicts.append(deal_dict)
-
-        # Run the appropriate analysis
-        if analysis_type == "pipeline_health":
-            result = self._analyze_pipeline_health(deal_dicts)
-        elif analysis_type == "conversion_rates":
-            result = self._analyze_conversion_rates(deal_dicts)
-        elif analysis_type == "revenue_forecast":
-            result = self._forecast_revenue(deal_dicts)
-        elif analysis_type == "stalled_deals":
-            result = self._identify_stalled_deals(deal_dicts)
-        else:
-            # Default to general deal summary
-            result = self._generate_deal_summary(deal_dicts)
+
+        if frame is None:
+            # Build the deal columns once per workspace and reuse them until
+            # the cache entry expires or the deals are re-synced
+            generation = deal_analysis_cache.generation(workspace_id)
+            deals = await self.deal_repository.get_deal_rows(workspace_id)
+            frame = DealFrame.from_rows(deals)
+            deal_analysis_cache.set(workspace_id, generation, frame)
+
+        # Run the appropriate analysis, defaulting to a general deal summary
+        analyzer = self._ANALYZERS.get(analysis_type, DealAnalysisTool._generate_deal_summary)
+        result = analyzer(self, frame)
 
         # Return raw data for the agent to interpret
         return {
             "analysis_type": analysis_type,
-            "deal_count": len(deals),
+            "deal_count": len(frame.records),
             "data": result["data"]
         }
 
     def _determine_analysis_type(self, query: str) -> str:
         """Determine what type of analysis is requested based on the query"""
-        query = query.lower()
-
-        if any(word in query for word in ["pipeline", "funnel", "stages"]):
-            return "pipeline_health"
-        elif any(word in query for word in ["conversion", "win rate", "close rate"]):
-            return "conversion_rates"
-        elif any(word in query for word in ["forecast", "predict", "revenue"]):
-            return "revenue_forecast"
-        elif any(word in query for word in ["stuck", "stalled", "bottleneck"]):
-            return "stalled_deals"
+        return _analysis_type_for(query.lower().strip())
 
-        return "summary"
-
-    def _analyze_pipeline_health(self, deals: List[Dict]) -> Dict[str, Any]:
+    def _analyze_pipeline_health(self, frame: DealFrame) -> Dict[str, Any]:
         """Analyze deal distribution across pipeline stages"""
-        # Group deals by pipeline and stage
-        pipeline_data = {}
-        for deal in deals:
-            pipeline_id = deal["pipeline_id"]
-            stage_id = deal["stage_id"]
-
-            if not pipeline_id or not stage_id:
-                continue
-
-            if pipeline_id not in pipeline_data:
-                pipeline_data[pipeline_id] = {"stages": {}, "total_value": 0, "count": 0}
-
-            if stage_id not in pipeline_data[pipeline_id]["stages"]:
-                pipeline_data[pipeline_id]["stages"][stage_id] = {
-                    "name": deal["stage_name"],
-                    "count": 0,
-                    "value": 0
-                }
-
-            pipeline_data[pipeline_id]["stages"][stage_id]["count"] += 1
-            pipeline_data[pipeline_id]["stages"][stage_id]["value"] += deal["amount"] or 0
-            pipeline_data[pipeline_id]["total_value"] += deal["amount"] or 0
-            pipeline_data[pipeline_id]["count"] += 1
+        groups = stage_groups(frame)
+        pipelines = groups["pipelines"].tolist()
+
+        pipeline_data = {
+            pipeline_id: {"stages": {}, "total_value": value, "count": count}
+            for pipeline_id, value, count in zip(
+                pipelines, groups["pipeline_values"].tolist(), groups["pipeline_counts"].tolist()
+            )
+        }
+        for pipeline_code, stage_id, name, count, value in zip(
+                groups["pair_pipeline"].tolist(),
+                groups["pair_stage"].tolist(),
+                groups["pair_name"].tolist(),
+                groups["pair_counts"].tolist(),
+                groups["pair_values"].tolist()
+        ):
+            pipeline_data[pipelines[pipeline_code]]["stages"][stage_id] = {
+                "name": name,
+                "count": count,
+                "value": value
+            }
 
         return {
             "data": pipeline_data
         }
 
-    def _analyze_conversion_rates(self, deals: List[Dict]) -> Dict[str, Any]:
+    def _analyze_conversion_rates(self, frame: DealFrame) -> Dict[str, Any]:
         """Analyze conversion rates between stages"""
-        # Group deals by pipeline and calculate conversion rates
-        pipeline_data = {}
-
-        # First, organize deals by pipeline and stage
-        for deal in deals:
-            pipeline_id = deal.get("pipeline_id")
-            stage_id = deal.get("stage_id")
-
-            if not pipeline_id or not stage_id:
-                continue
-
-            if pipeline_id not in pipeline_data:
-                pipeline_data[pipeline_id] = {"stages": {}, "total_deals": 0}
-
-            if stage_id not in pipeline_data[pipeline_id]["stages"]:
-                pipeline_data[pipeline_id]["stages"][stage_id] = {
-                    "name": deal.get("stage_name"),
-                    "count": 0
-                }
-
-            pipeline_data[pipeline_id]["stages"][stage_id]["count"] += 1
-            pipeline_data[pipeline_id]["total_deals"] += 1
-
-        # Calculate conversion rates between stages
-        for pipeline_id, pipeline in pipeline_data.items():
-            stages = sorted(
-                pipeline["stages"].items(),
-                key=lambda x: x[1]["count"],
-                reverse=True
-            )
-
-            # Assuming first stage has highest count
-            first_stage_count = stages[0][1]["count"] if stages else 0
-
-            for stage_id, stage_data in pipeline["stages"].items():
-                if first_stage_count > 0:
-                    stage_data["conversion_rate"] = (stage_data["count"] / first_stage_count) * 100
-                else:
-                    stage_data["conversion_rate"] = 0
+        groups = stage_groups(frame)
+        pipelines = groups["pipelines"].tolist()
+        pair_pipeline = groups["pair_pipeline"]
+        pair_counts = groups["pair_counts"]
+
+        # The stage with the highest count in each pipeline is taken as the first stage
+        first_stage_counts = np.zeros(len(pipelines), dtype=np.int64)
+        np.maximum.at(first_stage_counts, pair_pipeline, pair_counts)
+        conversion_rates = pair_counts / first_stage_counts[pair_pipeline] * 100
+
+        pipeline_data = {
+            pipeline_id: {"stages": {}, "total_deals": count}
+            for pipeline_id, count in zip(pipelines, groups["pipeline_counts"].tolist())
+        }
+        for pipeline_code, stage_id, name, count, conversion_rate in zip(
+                pair_pipeline.tolist(),
+                groups["pair_stage"].tolist(),
+                groups["pair_name"].tolist(),
+                pair_counts.tolist(),
+                conversion_rates.tolist()
+        ):
+            pipeline_data[pipelines[pipeline_code]]["stages"][stage_id] = {
+                "name": name,
+                "count": count,
+                "conversion_rate": conversion_rate
+            }
 
         return {
             "data": pipeline_data
         }
 
-    def _forecast_revenue(self, deals: List[Dict]) -> Dict[str, Any]:
+    def _forecast_revenue(self, frame: DealFrame) -> Dict[str, Any]:
         """Generate revenue forecast based on deal probabilities"""
-        # Calculate expected revenue based on probability
-        forecasted_revenue = 0
-        weighted_by_stage = {}
-        expected_close_dates = {}
-
-        for deal in deals:
-            amount = deal.get("amount") or 0
-            probability = deal.get("probability") or 0
-            stage_id = deal.get("stage_id")
-            stage_name = deal.get("stage_name")
-            close_date = deal.get("close_date")
-
-            # Skip deals with no amount or probability
-            if amount <= 0 or probability <= 0:
-                continue
-
-            # Calculate weighted revenue
-            weighted_revenue = amount * (probability / 100)
-            forecasted_revenue += weighted_revenue
-
-            # Group by stage
-            if stage_id:
-                if stage_id not in weighted_by_stage:
-                    weighted_by_stage[stage_id] = {
-                        "name": stage_name,
-                        "total": 0,
-                        "count": 0
-                    }
-                weighted_by_stage[stage_id]["total"] += weighted_revenue
-                weighted_by_stage[stage_id]["count"] += 1
-
-            # Group by close date (month)
-            if close_date:
-                month = close_date[:7]  # YYYY-MM format
-                if month not in expected_close_dates:
-                    expected_close_dates[month] = {
-                        "total": 0,
-                        "count": 0
-                    }
-                expected_close_dates[month]["total"] += weighted_revenue
-                expected_close_dates[month]["count"] += 1
+        # Weighted revenue of the deals with an amount and probability
+        rows, revenue = weighted_revenue(frame)
+
+        # Group by stage
+        stages, counts, totals, first = group_totals(frame.stage_code[rows], frame.stages, revenue)
+        weighted_by_stage = {
+            stage_id: {"name": name, "total": total, "count": count}
+            for stage_id, name, total, count in zip(
+                stages.tolist(), frame.stage_name[rows[first]].tolist(), totals.tolist(), counts.tolist()
+            )
+        }
+
+        # Group by close date (month)
+        months, counts, totals, _ = group_totals(frame.close_month_code[rows], frame.close_months, revenue)
+        expected_close_dates = {
+            month: {"total": total, "count": count}
+            for month, total, count in zip(months.tolist(), totals.tolist(), counts.tolist())
+        }
 
         return {
             "data": {
-                "forecasted_revenue": forecasted_revenue,
+                "forecasted_revenue": float(revenue.sum()),
                 "by_stage": weighted_by_stage,
                 "by_month": expected_close_dates
             }
         }
 
-    def _identify_stalled_deals(self, deals: List[Dict]) -> Dict[str, Any]:
+    def _identify_stalled_deals(self, frame: DealFrame) -> Dict[str, Any]:
         """Identify deals that have been stuck in a stage too long"""
-        stalled_deals = []
-
-        for deal in deals:
-            days_in_stage = deal.get("days_in_stage") or 0
-
-            # Consider deals stalled if in stage for more than 30 days
-            if days_in_stage > 30:
-                stalled_deals.append({
-                    "id": deal.get("id"),
-                    "name": deal.get("name"),
-                    "amount": deal.get("amount"),
-                    "stage_name": deal.get("stage_name"),
-                    "days_in_stage": days_in_stage,
-                    "probability": deal.get("probability")
-                })
-
-        # Sort by days in stage (descending)
-        stalled_deals.sort(key=lambda x: x["days_in_stage"], reverse=True)
+        days_in_stage = frame.days_in_stage
+
+        # Consider deals stalled if in stage for too long, longest first
+        rows = np.flatnonzero(days_in_stage > STALLED_DEAL_DAYS)
+        rows = rows[np.argsort(-days_in_stage[rows], kind="stable")]
+
+        records = frame.records
+        return self._stalled_deals_data([records[i] for i in rows.tolist()])
+
+    @staticmethod
+    def _stalled_deals_data(deals: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+        """Shape stalled deal rows, already filtered and sorted, into the analysis result"""
+        stalled_deals = [
+            {
+                "id": deal["id"],
+                "name": deal["name"],
+                "amount": deal["amount"],
+                "stage_name": deal["stage_name"],
+                "days_in_stage": deal["days_in_stage"],
+                "probability": deal["probability"]
+            }
+            for deal in deals
+        ]
 
         return {
             "data": {
@@ -250,39 +225,28 @@ class DealAnalysisTool(BaseTool):
             }
         }
 
-    def _generate_deal_summary(self, deals: List[Dict]) -> Dict[str, Any]:
+    def _generate_deal_summary(self, frame: DealFrame) -> Dict[str, Any]:
         """Generate a general summary of deals"""
-        total_count = len(deals)
-        total_value = sum(deal.get("amount") or 0 for deal in deals)
+        amount = frame.amount
+        total_count = len(amount)
+        total_value = float(amount.sum())
         avg_value = total_value / total_count if total_count > 0 else 0
 
         # Count by stage
-        stages = {}
-        pipelines = {}
-
-        for deal in deals:
-            pipeline_id = deal.get("pipeline_id")
-            stage_id = deal.get("stage_id")
-            stage_name = deal.get("stage_name")
-
-            if stage_id:
-                if stage_id not in stages:
-                    stages[stage_id] = {
-                        "name": stage_name,
-                        "count": 0,
-                        "value": 0
-                    }
-                stages[stage_id]["count"] += 1
-                stages[stage_id]["value"] += deal.get("amount") or 0
-
-            if pipeline_id:
-                if pipeline_id not in pipelines:
-                    pipelines[pipeline_id] = {
-                        "count": 0,
-                        "value": 0
-                    }
-                pipelines[pipeline_id]["count"] += 1
-                pipelines[pipeline_id]["value"] += deal.get("amount") or 0
+        stage_ids, counts, values, first = group_totals(frame.stage_code, frame.stages, amount)
+        stages = {
+            stage_id: {"name": name, "count": count, "value": value}
+            for stage_id, name, count, value in zip(
+                stage_ids.tolist(), frame.stage_name[first].tolist(), counts.tolist(), values.tolist()
+            )
+        }
+
+        # Count by pipeline
+        pipeline_ids, counts, values, _ = group_totals(frame.pipeline_code, frame.pipelines, amount)
+        pipelines = {
+            pipeline_id: {"count": count, "value": value}
+            for pipeline_id, count, value in zip(pipeline_ids.tolist(), counts.tolist(), values.tolist())
+        }
 
         return {
             "data": {
@@ -293,3 +257,11 @@ class DealAnalysisTool(BaseTool):
                 "by_pipeline": pipelines
             }
         }
+
+    # Analysis type -> analyzer, looked up once per call instead of an if/elif chain
+    _ANALYZERS = {
+        "pipeline_health": _analyze_pipeline_health,
+        "conversion_rates": _analyze_conversion_rates,
+        "revenue_forecast": _forecast_revenue,
+        "stalled_deals": _identify_stalled_deals,
+    }
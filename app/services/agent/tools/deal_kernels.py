@@ -0,0 +1,174 @@
+# app/services/agent/tools/deal_kernels.py
+from operator import itemgetter
+from typing import Any, Dict, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+
+class DealFrame(NamedTuple):
+    """
+    Column arrays of a workspace's deals, shared by every deal analysis
+
+    Pipeline, stage and close-month keys are factorized once into integer
+    codes (-1 where missing) with their vocabularies, so the analyzers group by
+    integers instead of re-hashing strings. Missing amounts, probabilities and
+    days count as 0. The source rows are kept for outputs that echo raw fields.
+    """
+    records: Sequence[Mapping[str, Any]]
+    amount: np.ndarray
+    probability: np.ndarray
+    days_in_stage: np.ndarray
+    pipeline_code: np.ndarray
+    pipelines: np.ndarray
+    stage_code: np.ndarray
+    stages: np.ndarray
+    stage_name: np.ndarray
+    close_month_code: np.ndarray
+    close_months: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, Any]]) -> "DealFrame":
+        """Build the frame from deal rows (see DealRepository.get_deal_rows)"""
+        n = len(rows)
+        # One C-level getter call per row, then transpose into column tuples
+        pipeline_ids, stage_ids, stage_names, close_dates, amounts, probabilities, days = (
+            zip(*map(_FRAME_FIELDS, rows)) if n else ((),) * 7
+        )
+
+        pipeline_code, pipelines = encode(pipeline_ids)
+        stage_code, stages = encode(stage_ids)
+        close_month_code, close_months = encode_months(close_dates)
+        return cls(
+            records=rows,
+            amount=np.fromiter((value or 0 for value in amounts), dtype=np.float64, count=n),
+            probability=np.fromiter((value or 0 for value in probabilities), dtype=np.float64, count=n),
+            days_in_stage=np.fromiter((value or 0 for value in days), dtype=np.int64, count=n),
+            pipeline_code=pipeline_code,
+            pipelines=pipelines,
+            stage_code=stage_code,
+            stages=stages,
+            stage_name=np.array(stage_names, dtype=object),
+            close_month_code=close_month_code,
+            close_months=close_months,
+        )
+
+
+# Month index of a missing date in encode_months
+_NO_MONTH = np.iinfo(np.int64).min
+
+# Row fields read by DealFrame.from_rows, in unpacking order
+_FRAME_FIELDS = itemgetter(
+    "pipeline_id", "stage_id", "stage_name", "close_date", "amount", "probability", "days_in_stage"
+)
+
+
+def factorize(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode values as integer codes numbered in order of first appearance
+
+    Returns (codes, uniques, first_index) so grouped outputs keep the key order
+    of dicts built row by row.
+    """
+    uniques, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty(len(order), dtype=np.intp)
+    rank[order] = np.arange(len(order))
+    return rank[inverse.reshape(-1)], uniques[order], first[order]
+
+
+def encode(keys: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Factorize string keys; falsy keys get code -1. Returns (codes, vocabulary)"""
+    values = np.array([key or "" for key in keys], dtype=str)
+    codes = np.full(len(values), -1, dtype=np.intp)
+    rows = np.flatnonzero(values != "")
+    codes[rows], vocabulary, _ = factorize(values[rows])
+    return codes, vocabulary
+
+
+def encode_months(dates: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factorize dates by calendar month; missing dates get code -1
+
+    Months are grouped as integers (months since 1970-01) and only the
+    distinct ones are formatted, so the vocabulary holds "YYYY-MM" strings
+    without a strftime per row. Returns (codes, vocabulary).
+    """
+    months = np.fromiter(
+        ((date.year - 1970) * 12 + date.month - 1 if date else _NO_MONTH for date in dates),
+        dtype=np.int64,
+        count=len(dates)
+    )
+    codes = np.full(len(months), -1, dtype=np.intp)
+    rows = np.flatnonzero(months != _NO_MONTH)
+    codes[rows], vocabulary, _ = factorize(months[rows])
+    return codes, np.datetime_as_string(vocabulary.astype("datetime64[M]"), unit="M")
+
+
+def group_by_code(
+        codes: np.ndarray,
+        size: int,
+        weights: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count and sum `weights` by non-negative integer code below `size`
+
+    A single np.bincount pass per reduction, with no sort over the rows.
+    Returns (codes, counts, sums, first_row) for the codes present, in order of
+    first appearance.
+    """
+    counts = np.bincount(codes, minlength=size)
+    sums = np.bincount(codes, weights=weights, minlength=size)
+    first = np.full(size, len(codes), dtype=np.intp)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+
+    present = np.flatnonzero(counts)
+    present = present[np.argsort(first[present])]
+    return present, counts[present], sums[present], first[present]
+
+
+def group_totals(
+        codes: np.ndarray,
+        vocabulary: np.ndarray,
+        weights: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Count and sum `weights` by code, skipping -1; returns (keys, counts, sums, first_row)"""
+    rows = np.flatnonzero(codes >= 0)
+    keys, counts, sums, first = group_by_code(codes[rows], len(vocabulary), weights[rows])
+    return vocabulary[keys], counts, sums, rows[first]
+
+
+def stage_groups(frame: DealFrame) -> Dict[str, np.ndarray]:
+    """Count and sum amounts by pipeline and by (pipeline, stage), skipping deals missing either"""
+    rows = np.flatnonzero((frame.pipeline_code >= 0) & (frame.stage_code >= 0))
+    pipeline_codes = frame.pipeline_code[rows]
+    n_stages = len(frame.stages)
+    amount = frame.amount[rows]
+
+    pipelines, pipeline_counts, pipeline_values, _ = group_by_code(
+        pipeline_codes, len(frame.pipelines), amount
+    )
+    pairs, pair_counts, pair_values, pair_first = group_by_code(
+        pipeline_codes * n_stages + frame.stage_code[rows], len(frame.pipelines) * n_stages, amount
+    )
+
+    # Position of each pipeline in the output, to link the pairs to it
+    pipeline_position = np.empty(len(frame.pipelines), dtype=np.intp)
+    pipeline_position[pipelines] = np.arange(len(pipelines))
+
+    return {
+        "pipelines": frame.pipelines[pipelines],
+        "pipeline_counts": pipeline_counts,
+        "pipeline_values": pipeline_values,
+        # Per (pipeline, stage) pair, in order of first appearance
+        "pair_pipeline": pipeline_position[pairs // n_stages],
+        "pair_stage": frame.stages[pairs % n_stages],
+        "pair_name": frame.stage_name[rows[pair_first]],
+        "pair_counts": pair_counts,
+        "pair_values": pair_values,
+    }
+
+
+def weighted_revenue(frame: DealFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Probability-weighted amounts of the deals with a positive amount and probability; returns (rows, weighted)"""
+    rows = np.flatnonzero((frame.amount > 0) & (frame.probability > 0))
+    return rows, frame.amount[rows] * (frame.probability[rows] / 100)
@@ -1,6 +1,7 @@
 # app/services/agent/tool_registry.py
 from typing import Dict, List, Any, Optional
 from abc import ABC, abstractmethod
+from functools import cached_property
 
 
 class BaseTool(ABC):
@@ -35,14 +36,30 @@ class ToolRegistry:
     def register_tool(self, tool: BaseTool) -> None:
         """Register a tool with the registry"""
         self.tools[tool.name] = tool
+        # Drop the cached descriptions so they are rebuilt with the new tool
+        self.__dict__.pop("tools_with_descriptions", None)
+        self.__dict__.pop("tools_text", None)
 
     def get_tool_by_name(self, name: str) -> Optional[BaseTool]:
         """Get a tool by name"""
         return self.tools.get(name)
 
-    def get_tools_with_descriptions(self) -> List[Dict[str, str]]:
-        """Get a list of all tools with their descriptions"""
+    @cached_property
+    def tools_with_descriptions(self) -> List[Dict[str, str]]:
+        """All tools with their descriptions, built once per registration change"""
         return [
             {"name": tool.name, "description": tool.description}
             for tool in self.tools.values()
         ]
+
+    @cached_property
+    def tools_text(self) -> str:
+        """Tool list as rendered in the LLM prompt"""
+        return "\n".join([
+            f"- {tool['name']}: {tool['description']}"
+            for tool in self.tools_with_descriptions
+        ])
+
+    def get_tools_with_descriptions(self) -> List[Dict[str, str]]:
+        """Get a list of all tools with their descriptions"""
+        return self.tools_with_descriptions
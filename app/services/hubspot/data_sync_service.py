@@ -26,6 +26,10 @@ class DataSyncService:
         hubspot_client = await self.hubspot_service.get_client(workspace_id)
         hubspot_data = await hubspot_client.get_deals_with_pipelines()
 
+        # One clock reading per sync so every snapshot shares the same reference time
+        now = datetime.now(timezone.utc)
+        sync_date = now.replace(tzinfo=None)
+
         deal_snapshots = []
         for deal in hubspot_data.deals:
             pipeline = next((p for p in hubspot_data.pipelines if p.id == deal.pipeline), None)
@@ -35,8 +39,7 @@ class DataSyncService:
             days_in_pipeline = None
 
             if deal.create_date:
-                current_date = datetime.now(timezone.utc)  # Use timezone-aware timestamp
-                days_in_pipeline = (current_date - deal.create_date).days
+                days_in_pipeline = (now - deal.create_date).days
 
             deal_snapshot = {
                 "id": generate_hubspot_deal_snapshot_id(),
@@ -58,7 +61,7 @@ class DataSyncService:
                 "contact_ids": deal.contact_ids,
                 "company_ids": deal.company_ids,
                 "properties": {},
-                "sync_date": datetime.utcnow()
+                "sync_date": sync_date
             }
             deal_snapshots.append(deal_snapshot)
 
@@ -67,5 +70,5 @@ class DataSyncService:
 
         return {
             "deals_synced": len(deal_snapshots),
-            "sync_date": datetime.utcnow().isoformat()
+            "sync_date": sync_date.isoformat()
         }
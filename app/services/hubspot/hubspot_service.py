@@ -1,7 +1,7 @@
+import logging
 import uuid
 from http.client import HTTPException
 from typing import Optional, List, Dict
-from venv import logger
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +19,9 @@ from app.core.errors import NotFoundError, IntegrationError
 from app.core.id_generator.id_generator import generate_hubspot_id
 
 
+logger = logging.getLogger(__name__)
+
+
 class HubspotService:
     def __init__(
             self,
@@ -90,9 +93,7 @@ class HubspotService:
 
         # Convert current UTC time to be timezone-aware
         current_time = datetime.utcnow().replace(tzinfo=timezone.utc)
-        print("Current time:", current_time)
-        print("Expires at:", credentials.expires_at)
-        print("Expires at type:", type(credentials.expires_at))
+        logger.debug("HubSpot token for %s expires at %s (now %s)", workspace_id, credentials.expires_at, current_time)
 
         if current_time >= credentials.expires_at:
             token_data = await self.auth_client.refresh_token(credentials.refresh_token)
@@ -141,7 +142,7 @@ class HubspotService:
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Invalid data format: {str(e)}")
         except Exception as e:
-            logger.error(f"Error fetching HubSpot lists: {str(e)}")
+            logger.exception("Error fetching HubSpot lists")
             raise HTTPException(status_code=500, detail="Failed to fetch HubSpot lists")
 
 
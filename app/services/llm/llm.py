@@ -1,10 +1,29 @@
 # app/services/llm/llm_service.py
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, List, AsyncIterator
 import re
+from functools import lru_cache
+from string import Formatter
+import orjson
 from openai import AsyncOpenAI
 
-from app.services.llm.prompts.prompts import REACT_AGENT_SYSTEM_PROMPT
+from app.models.agent import AgentState
+from app.services.llm.prompts.prompts import REACT_AGENT_SYSTEM_PROMPT, REACT_AGENT_STEP_PROMPT
+
+# The step template split once into (literal, placeholder) pairs, so
+# rendering a step's prompt is a single join instead of a format() parse
+REACT_STEP_PROMPT_PARTS = [
+    (literal, field or "")
+    for literal, field, _, _ in Formatter().parse(REACT_AGENT_STEP_PROMPT)
+]
+
+# Where the answer text starts in a response that chose final_answer
+FINAL_ANSWER_INPUT = re.compile(r"Action:\s*final_answer\s*Action Input:", re.IGNORECASE)
+
+
+@lru_cache(maxsize=32)
+def _system_prompt(tools_text: str) -> str:
+    """Render the static system prompt once per tool set"""
+    return REACT_AGENT_SYSTEM_PROMPT.format(tools_text=tools_text)
 
 
 class LLMService:
@@ -13,47 +32,106 @@ class LLMService:
 
     async def get_next_action(
             self,
-            agent_state: Dict[str, Any]
+            agent_state: AgentState
     ) -> Dict[str, Any]:
         """
         Get the next action from the LLM based on the agent state
         This implements the ReAct pattern (Reasoning + Acting)
         """
+        response = await self.openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=self._build_messages(agent_state),
+            temperature=0.2
+        )
+
+        return self._parse_action(response.choices[0].message.content)
+
+    async def stream_next_action(
+            self,
+            agent_state: AgentState
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the next action from the LLM
 
-        # Build prompt with available tools
-        tools_text = "\n".join([
-            f"- {tool['name']}: {tool['description']}"
-            for tool in agent_state["tools"]
-        ])
+        While the LLM writes a final answer, yields {"answer_delta": text}
+        chunks as they arrive; always ends with {"action": action}, the same
+        dict get_next_action returns.
+        """
+        stream = await self.openai_client.chat.completions.create(
+            model="gpt-4o",
+            messages=self._build_messages(agent_state),
+            temperature=0.2,
+            stream=True
+        )
 
-        # Include past actions and results
-        action_history = ""
-        for i, action in enumerate(agent_state.get("actions", [])):
-            action_history += f"\nStep {i+1}:\n"
-            action_history += f"Tool: {action.get('tool')}\n"
-            action_history += f"Input: {action.get('input')}\n"
+        response_text = ""
+        answer_start = None
+        streamed = 0
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            response_text += chunk.choices[0].delta.content
 
+            if answer_start is None:
+                match = FINAL_ANSWER_INPUT.search(response_text)
+                if not match:
+                    continue
+                answer_start = match.end()
+
+            answer = response_text[answer_start:].lstrip()
+            if len(answer) > streamed:
+                yield {"answer_delta": answer[streamed:]}
+                streamed = len(answer)
+
+        yield {"action": self._parse_action(response_text)}
+
+    def _build_messages(self, agent_state: AgentState) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for the current agent state
+
+        The system message depends only on the tool set, and the user message
+        only grows between steps, so consecutive calls share a long identical
+        prefix that the provider's prompt cache can reuse.
+        """
+        return [
+            {"role": "system", "content": _system_prompt(agent_state.tools_text)},
+            {"role": "user", "content": self._build_step_prompt(agent_state)}
+        ]
+
+    def _build_step_prompt(self, agent_state: AgentState) -> str:
+        """Render the per-step part of the ReAct prompt"""
+
+        # Include past actions and results
+        history_parts = []
+        for i, action in enumerate(agent_state.actions):
             result = action.get('result', {})
             if isinstance(result, dict):
-                result_str = json.dumps(result, indent=2)
+                # Compact output: indentation whitespace only costs prompt tokens
+                result_str = orjson.dumps(
+                    result,
+                    default=str,
+                    option=orjson.OPT_NON_STR_KEYS
+                ).decode()
             else:
                 result_str = str(result)
 
-            action_history += f"Result: {result_str}\n"
-
-        prompt = REACT_AGENT_SYSTEM_PROMPT.format(
-            agent_state=agent_state['query'],
-            tools_text=tools_text,
-            action_history=action_history
-        )
+            history_parts.append(
+                f"\nStep {i+1}:\n"
+                f"Tool: {action.get('tool')}\n"
+                f"Input: {action.get('input')}\n"
+                f"Result: {result_str}\n"
+            )
 
-        response = await self.openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2
-        )
+        values = {
+            "agent_state": agent_state.query,
+            "action_history": "".join(history_parts),
+            "": ""
+        }
+        return "".join([literal + values[field] for literal, field in REACT_STEP_PROMPT_PARTS])
 
-        response_text = response.choices[0].message.content
+    @staticmethod
+    def _parse_action(response_text: str) -> Dict[str, Any]:
+        """Parse the thought, action and action input out of an LLM response"""
 
         # Extract thought, action, and action input using regex
         thought_match = re.search(r"Thought: (.*?)(?=\n\nAction:|\Z)", response_text, re.DOTALL)
@@ -76,4 +154,4 @@ class LLMService:
             "action_type": action_type,
             "tool_name": tool_name,
             "action_input": action_input
-        }
\ No newline at end of file
+        }
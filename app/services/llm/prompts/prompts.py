@@ -1,14 +1,12 @@
-REACT_AGENT_SYSTEM_PROMPT = """
+from textwrap import dedent
+
+# Static for a given tool set; sent first so the provider can reuse its cached prefix
+REACT_AGENT_SYSTEM_PROMPT = dedent("""
         You are an AI assistant helping with CRM data analysis and document retrieval. \n
         
-        USER QUERY: {agent_state}\n
-        
         AVAILABLE TOOLS:
         {tools_text}\n
         
-        PREVIOUS ACTIONS:
-        {action_history}\n
-        
         Think step by step about how to best answer the user's query.
         You can use the available tools to gather information.\n
         
@@ -21,4 +19,12 @@ REACT_AGENT_SYSTEM_PROMPT = """
         Action: <either the name of a tool to use OR "final_answer">\n
         
         Action Input: <input to the tool OR your final answer to the user>
- """
\ No newline at end of file
+ """)
+
+# Changes every step; only the history grows between steps of one query
+REACT_AGENT_STEP_PROMPT = dedent("""
+        USER QUERY: {agent_state}\n
+        
+        PREVIOUS ACTIONS:
+        {action_history}\n
+ """)
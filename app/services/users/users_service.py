@@ -119,10 +119,32 @@ class UserService:
                 detail=f"Failed to update user: {str(e)}"
             )
 
-    async def get_account_users(self, account_id: str) -> List[User]:
-        """Get all users for an account."""
+    async def get_account_users(
+            self,
+            account_id: str,
+            limit: int = 100,
+            after_id: Optional[str] = None
+    ) -> List[User]:
+        """Get a page of users for an account (pass the last user ID as after_id for the next page)."""
+        try:
+            return await self.repository.get_users_by_account(
+                account_id,
+                limit=limit,
+                after_id=after_id
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to get account users: {str(e)}"
+            )
+
+    async def get_all_account_users(self, account_id: str) -> List[User]:
+        """Get every user for an account, fetched in partitions."""
         try:
-            return await self.repository.get_users_by_account(account_id)
+            users: List[User] = []
+            async for partition in self.repository.iter_users_by_account(account_id):
+                users.extend(partition)
+            return users
         except Exception as e:
             raise HTTPException(
                 status_code=500,
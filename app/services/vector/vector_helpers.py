@@ -5,6 +5,7 @@ from typing import List, BinaryIO, Tuple, Dict, Any
 
 import PyPDF2
 import mammoth
+import numpy as np
 import pandas as pd
 
 from app.models.vector import DocumentChunk, DocumentType
@@ -24,6 +25,13 @@ def convert_to_dict(obj):
         return obj
 
 
+def normalize_embedding(embedding: List[float]) -> np.ndarray:
+    """Scale an embedding to unit length as a float32 array."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    vector /= np.linalg.norm(vector) + 1e-12
+    return vector
+
+
 def get_document_type(filename: str) -> str:
     """Determine document type from filename."""
     ext = os.path.splitext(filename)[1].lower().lstrip('.')
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import io
 import json
@@ -24,7 +25,13 @@ from app.models.vector import (
     DocumentType
 )
 from app.repositories.vector.vector_store import VectorRepository
-from app.services.vector.vector_helpers import convert_to_dict, get_document_type, extract_text, split_text
+from app.services.vector.vector_helpers import (
+    convert_to_dict,
+    get_document_type,
+    extract_text,
+    split_text,
+    normalize_embedding
+)
 
 
 class VectorDBService:
@@ -39,6 +46,8 @@ class VectorDBService:
         self.openai_client = openai_client
         self.chunk_size = 1000  # Characters per chunk
         self.chunk_overlap = 200  # Character overlap between chunks
+        self.embedding_batch_size = 100  # Chunks per embeddings API call
+        self.embedding_concurrency = 4  # Embeddings API calls in flight
 
     async def process_document(
             self,
@@ -85,7 +94,9 @@ class VectorDBService:
                 document_metadata=custom_metadata or {}
             )
 
-            document = await self.repository.create_document(document)
+            async with self.repository.transaction():
+                document = await self.repository.create_document(document)
+            document_id = document.id
 
             try:
                 text_content, metadata = await extract_text(
@@ -96,32 +107,40 @@ class VectorDBService:
 
                 metadata = convert_to_dict(metadata)
 
-                document = await self.repository.update_document_metadata(
-                    document_id=document.id,
-                    metadata={**(document.document_metadata or {}), **metadata}
-                )
-
-                chunks = split_text(
-                    text=text_content,
-                    document_id=document.id,
-                    chunk_size=self.chunk_size,
-                    chunk_overlap=self.chunk_overlap
-                )
-                saved_chunks = await self.repository.create_chunks_batch(chunks)
-
-                await self._process_embeddings(saved_chunks)
-
-                document = await self.repository.update_document_status(
-                    document_id=document.id,
-                    status=DocumentStatus.COMPLETED.value
-                )
+                # One commit for the whole document; chunks and embeddings can be
+                # regenerated, so the commit need not wait for the WAL flush
+                async with self.repository.transaction(synchronous_commit=False):
+                    await self.repository.update_document_metadata(
+                        document_id=document_id,
+                        metadata=metadata
+                    )
+
+                    # Mark the document completed before its embeddings exist: the
+                    # insert trigger then copies the final status onto each row,
+                    # instead of the status trigger rewriting every embedding. The
+                    # PROCESSING -> COMPLETED change is only visible on commit
+                    document = await self.repository.update_document_status(
+                        document_id=document_id,
+                        status=DocumentStatus.COMPLETED.value
+                    )
+
+                    chunks = split_text(
+                        text=text_content,
+                        document_id=document_id,
+                        chunk_size=self.chunk_size,
+                        chunk_overlap=self.chunk_overlap
+                    )
+                    saved_chunks = await self.repository.create_chunks_batch(chunks)
+
+                    await self._process_embeddings(saved_chunks)
 
             except Exception as e:
-                _ = await self.repository.update_document_status(
-                    document_id=document.id,
-                    status=DocumentStatus.ERROR.value,
-                    error_message=str(e)
-                )
+                async with self.repository.transaction():
+                    _ = await self.repository.update_document_status(
+                        document_id=document_id,
+                        status=DocumentStatus.ERROR.value,
+                        error_message=str(e)
+                    )
                 raise
 
             return document
@@ -135,39 +154,49 @@ class VectorDBService:
     async def _process_embeddings(self, chunks: List[DocumentChunk]) -> List[DocumentEmbedding]:
         """
         Generate embeddings for chunks and save them to the database.
+
+        Embedding batches are requested concurrently (bounded by
+        embedding_concurrency); results are written to the database in order
+        as batches complete.
         """
         embeddings = []
-        chunk_batches = [chunks[i:i + 100] for i in range(0, len(chunks), 100)]
-
-        for batch in chunk_batches:
-            texts = [chunk.content for chunk in batch]
-
-            response = await self.openai_client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=texts
-            )
-
-            embedding_vectors = [item.embedding for item in response.data]
-
-            batch_embeddings = []
-            for i, chunk in enumerate(batch):
-                # Create the embedding object with the vector data
-                embedding = DocumentEmbedding(
-                    id=generate_document_embedding_id(),
-                    chunk_id=chunk.id,
-                    embedding=embedding_vectors[i]  # Pass the raw list directly
+        chunk_batches = [
+            chunks[i:i + self.embedding_batch_size]
+            for i in range(0, len(chunks), self.embedding_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.embedding_concurrency)
+
+        async def embed_batch(batch: List[DocumentChunk]) -> List[List[float]]:
+            async with semaphore:
+                response = await self.openai_client.embeddings.create(
+                    model="text-embedding-ada-002",
+                    input=[chunk.content for chunk in batch]
                 )
+            return [item.embedding for item in response.data]
 
-                # Add to session and flush to get the ID
-                self.db.add(embedding)
-                await self.db.flush()
-
-                batch_embeddings.append(embedding)
-
-            embeddings.extend(batch_embeddings)
-
-            # Commit after each batch
-            await self.db.commit()
+        tasks = [asyncio.create_task(embed_batch(batch)) for batch in chunk_batches]
+        try:
+            for batch, task in zip(chunk_batches, tasks):
+                embedding_vectors = await task
+
+                batch_embeddings = [
+                    DocumentEmbedding(
+                        id=generate_document_embedding_id(),
+                        chunk_id=chunk.id,
+                        embedding=embedding_vector
+                    )
+                    for chunk, embedding_vector in zip(batch, embedding_vectors)
+                ]
+
+                # One executemany INSERT per batch; the session is
+                # only ever used from this coroutine
+                embeddings.extend(await self.repository.create_embeddings_batch(batch_embeddings))
+        finally:
+            # On failure, stop the remaining requests and retrieve their
+            # outcomes so none are left running or reported as unretrieved
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         return embeddings
 
@@ -189,7 +218,8 @@ class VectorDBService:
                 input=[query]
             )
 
-            query_embedding = response.data[0].embedding
+            # Normalized once here; every search path scores with plain dot products
+            query_embedding = normalize_embedding(response.data[0].embedding)
 
             # 2. Find similar document chunks
             results = await self.repository.search_similar_embeddings(
@@ -210,7 +240,8 @@ class VectorDBService:
                 }
             )
 
-            await self.repository.create_search(search_record)
+            async with self.repository.transaction():
+                await self.repository.create_search(search_record)
 
             return results
 
@@ -250,9 +281,6 @@ class VectorDBService:
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        # Get all chunks
-        chunks = await self.repository.get_chunks_by_document(document_id)
-
         # Format results
         result = {
             "document_id": document.id,
@@ -266,7 +294,7 @@ class VectorDBService:
                     "content": chunk.content,
                     "metadata": chunk.metadata
                 }
-                for chunk in chunks
+                async for chunk in self.repository.iter_chunks_by_document(document_id)
             ]
         }
 
@@ -98,8 +98,10 @@ class WorkspaceService:
             account_id: str
     ) -> list[WorkspaceResponse]:
         """Get all workspaces for a specific account."""
-        workspaces = await self.repository.get_workspaces_by_account(account_id)
-        return [transform_workspace_response(w) for w in workspaces]
+        return [
+            transform_workspace_response(w)
+            async for w in self.repository.iter_workspaces_by_account(account_id)
+        ]
 
     async def get_workspaces(
             self,